@@ -1,13 +1,23 @@
-from PySide2 import QtCore, QtGui, QtWidgets, QtUiTools
+from PySide2 import QtCore, QtGui, QtWidgets
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 import maya.OpenMayaUI as mui
 import shiboken2
-import sys
 import os
+import re
+import copy
 import math
+import uuid
+import array
+import bisect
+import json
+import zlib
+import base64
 import pickle
+import hashlib
 import maya.cmds as cmds
-from functools import partial
+import maya.mel as mel
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 # sys.path.append(os.path.dirname(__file__))
 # import Editor
 
@@ -17,7 +27,9 @@ class Martopicker(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
 		self.setInterface()
 		self.connectInterface()
-		self.maya_job = cmds.scriptJob(event=["SelectionChanged", self.editor.selectionFromViewport])
+
+		self.session = PickerSession.get()
+		self.session.register(self.editor)
 
 	def setInterface(self):
 		main_layout = QtWidgets.QVBoxLayout()
@@ -33,6 +45,17 @@ class Martopicker(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 		self.mode_button.setMaximumWidth(100)
 		self.mode_button.setCheckable(True)
 
+		self.key_overlay_checkbox = QtWidgets.QCheckBox("Keys")
+
+		self.library_button = QtWidgets.QPushButton("Library")
+		self.library_button.setMaximumWidth(100)
+
+		self.threaded_render_checkbox = QtWidgets.QCheckBox("Threaded Draw")
+
+		self.search_textfield = QtWidgets.QLineEdit()
+		self.search_textfield.setPlaceholderText("Search")
+		self.search_textfield.setMaximumWidth(150)
+
 		self.edit_buttons_widget = QtWidgets.QWidget()
 		edit_buttons_layout = QtWidgets.QHBoxLayout()
 		edit_buttons_layout.setContentsMargins(0, 0, 0, 0)
@@ -41,21 +64,39 @@ class Martopicker(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 		self.size_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
 		self.name_textfield = QtWidgets.QLineEdit()
 		self.add_scripted_button = QtWidgets.QPushButton("Add Scripted Button")
+		self.add_attribute_button = QtWidgets.QPushButton("Add Attribute Button")
+		self.add_pose_button = QtWidgets.QPushButton("Add Pose Button")
 		self.bg_image_button = QtWidgets.QPushButton("Change Background")
+		self.shape_combo = QtWidgets.QComboBox()
+		self.shape_combo.addItems(["ellipse", "rect", "polygon"])
+		self.svg_button = QtWidgets.QPushButton("Import SVG Shape")
+		self.mirror_button = QtWidgets.QPushButton("Mirror")
+		self.snap_checkbox = QtWidgets.QCheckBox("Snap")
+		self.snap_checkbox.setChecked(True)
 
 		edit_buttons_layout.addWidget(self.color_button)
 		edit_buttons_layout.addWidget(self.size_slider)
 		edit_buttons_layout.addWidget(self.name_textfield)
 		edit_buttons_layout.addWidget(self.add_scripted_button)
+		edit_buttons_layout.addWidget(self.add_attribute_button)
+		edit_buttons_layout.addWidget(self.add_pose_button)
 		edit_buttons_layout.addWidget(self.bg_image_button)
+		edit_buttons_layout.addWidget(self.shape_combo)
+		edit_buttons_layout.addWidget(self.svg_button)
+		edit_buttons_layout.addWidget(self.mirror_button)
+		edit_buttons_layout.addWidget(self.snap_checkbox)
 		self.edit_buttons_widget.setLayout(edit_buttons_layout)
 		self.edit_buttons_widget.setVisible(False)
 
 		self.editor = Editor(600, 400, self)
 
 		buttons_layout.addWidget(self.mode_button)
+		buttons_layout.addWidget(self.library_button)
+		buttons_layout.addWidget(self.key_overlay_checkbox)
+		buttons_layout.addWidget(self.threaded_render_checkbox)
 		buttons_layout.addWidget(self.edit_buttons_widget)
 		buttons_layout.addStretch(1)
+		buttons_layout.addWidget(self.search_textfield)
 
 		buttons_widget.setLayout(buttons_layout)
 
@@ -66,16 +107,36 @@ class Martopicker(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 
 	def connectInterface(self):
 		self.mode_button.clicked.connect(self.toggleEditModeCommand)
+		self.library_button.clicked.connect(self.libraryCommand)
+		self.key_overlay_checkbox.toggled.connect(self.editor.setKeyOverlay)
+		self.threaded_render_checkbox.toggled.connect(self.editor.setThreadedRender)
+		self.search_textfield.textChanged.connect(self.editor.setSearchText)
+		self.search_textfield.returnPressed.connect(self.editor.selectSearchMatches)
 		self.color_button.clicked.connect(self.chooseColorCommand)
 		self.size_slider.valueChanged.connect(self.sizeSliderCommand)
 		self.name_textfield.textEdited.connect(self.buttonNameChangedCommand)
 		self.add_scripted_button.clicked.connect(self.textEditorCommand)
+		self.add_attribute_button.clicked.connect(self.attributeEditorCommand)
+		self.add_pose_button.clicked.connect(self.addPoseCommand)
 		self.bg_image_button.clicked.connect(self.changeBackgroundCommand)
+		self.shape_combo.activated.connect(self.shapeChangedCommand)
+		self.svg_button.clicked.connect(self.importSvgCommand)
+		self.mirror_button.clicked.connect(self.mirrorCommand)
+		self.snap_checkbox.toggled.connect(self.editor.setSnapping)
 
 	def toggleEditModeCommand(self):
 		self.editor.toggleEditMode()
 		self.edit_buttons_widget.setVisible(self.editor.getEditMode())
 
+	def libraryCommand(self):
+		library = PickerLibrary(self)
+		library.exec()
+
+		picker_info = library.getData()
+
+		if picker_info:
+			self.editor.loadPicker(picker_info["path"])
+
 	def chooseColorCommand(self):
 		color = QtGui.QColor(128, 128, 128)
 
@@ -112,28 +173,373 @@ class Martopicker(MayaQWidgetDockableMixin, QtWidgets.QDialog):
 			self.editor.addEditorButton((50, 50), (20, 20), [], "rect", QtGui.QColor(255, 249, 23), "", button_info["script"])
 			self.editor.repaint()
 
+	def attributeEditorCommand(self):
+		selection = cmds.ls(sl=True)
+
+		if not selection:
+			cmds.warning("Martopicker: select the controls the attribute button should drive")
+			return
+
+		attribute_editor = AttributeEditor(self)
+		attribute_editor.exec()
+
+		button_info = attribute_editor.getData()
+
+		if button_info:
+			plug_names = [node + "." + button_info["attribute"] for node in selection]
+			invalid = [name for name in plug_names if not isNumericAttribute(name)]
+
+			if invalid:
+				cmds.warning("Martopicker: not a numeric attribute: " + ", ".join(invalid[:10]))
+				return
+
+			self.editor.addAttributeButton((50, 50), selection, button_info["attribute"], button_info["min"], button_info["max"])
+			self.editor.repaint()
+
+	def addPoseCommand(self):
+		selection = cmds.ls(sl=True)
+
+		if not selection:
+			cmds.warning("Martopicker: select the controls the pose should capture")
+			return
+
+		name, validate = QtWidgets.QInputDialog.getText(self, "Add pose button", "Pose name")
+
+		if validate and name:
+			self.editor.addPoseButton((50, 50), selection, name)
+			self.editor.repaint()
+
 	def changeBackgroundCommand(self):
 		image_path = QtWidgets.QFileDialog.getOpenFileName(caption="Load background image", filter="Images (*.png *.xpm *.jpg)")[0]
 
 		self.editor.setBackgroundImage(image_path)
 
+	def shapeChangedCommand(self):
+		self.editor.setButtonShape(self.shape_combo.currentText())
+
+	def importSvgCommand(self):
+		svg_path = QtWidgets.QFileDialog.getOpenFileName(caption="Import SVG shape", filter="SVG (*.svg)")[0]
+
+		if svg_path:
+			self.editor.setButtonSvgShape(svg_path)
+
+	def mirrorCommand(self):
+		if QtWidgets.QApplication.keyboardModifiers() == QtCore.Qt.ShiftModifier:
+			self.editor.mirrorButtons("y")
+		else:
+			self.editor.mirrorButtons("x")
+
 	def dockCloseEventTriggered(self):
-		cmds.scriptJob(kill=self.maya_job)
+		self.session.unregister(self.editor)
+		self.editor.setThreadedRender(False)
+
+		if self.editor.getPickerPath():
+			forgetPicker(self.editor.getPickerPath())
 
 	def keyPressEvent(self, e):
 		self.editor.keyPressEvent(e)
 
 
+class PickerSession(object):
+	instance = None
+
+	@classmethod
+	def get(cls):
+		if cls.instance is None:
+			cls.instance = PickerSession()
+		return cls.instance
+
+	def __init__(self):
+		self.editors = []
+		self.maya_job = None
+		self.viewport_selection = set()
+		self.node_cache = {}
+		self.cache_valid = False
+
+		self.key_jobs = []
+		self.anim_callbacks = []
+		self.curve_nodes = None
+		self.animated_nodes = set()
+		self.keyed_nodes = set()
+		self.key_cache = {}
+		self.key_refresh_pending = False
+		self.key_full_refresh = True
+
+	def register(self, editor):
+		if editor not in self.editors:
+			self.editors.append(editor)
+			editor.setSession(self)
+			self.invalidate()
+
+		if self.maya_job is None:
+			self.viewport_selection = set(cmds.ls(sl=True) or [])
+			self.maya_job = cmds.scriptJob(event=["SelectionChanged", self.selectionChanged])
+
+	def unregister(self, editor):
+		if editor in self.editors:
+			self.editors.remove(editor)
+			editor.setSession(None)
+			self.invalidate()
+			self.keyOverlayChanged()
+
+		if not self.editors and self.maya_job is not None:
+			if cmds.scriptJob(exists=self.maya_job):
+				cmds.scriptJob(kill=self.maya_job)
+			self.maya_job = None
+
+	def invalidate(self):
+		self.cache_valid = False
+		self.invalidateKeys()
+
+	def getNodeCache(self):
+		if not self.cache_valid:
+			self.node_cache = {}
+			for editor in self.editors:
+				for button in editor.buttons_list:
+					for sel in button.getSelection():
+						self.node_cache.setdefault(sel, []).append((editor, button))
+			self.cache_valid = True
+
+		return self.node_cache
+
+	def getViewportSelection(self):
+		return self.viewport_selection
+
+	def selectionChanged(self):
+		self.applySelection(set(cmds.ls(sl=True) or []))
+
+	def applySelection(self, selection):
+		changed = selection ^ self.viewport_selection
+		self.viewport_selection = selection
+
+		if not changed:
+			return
+
+		node_cache = self.getNodeCache()
+
+		affected = {}
+		for node in changed:
+			for editor, button in node_cache.get(node, ()):
+				affected.setdefault(editor, set()).add(button)
+
+		for editor, buttons in affected.items():
+			editor.selectionFromSession(buttons, selection)
+
+	def keyOverlayChanged(self):
+		overlay_editors = [editor for editor in self.editors if editor.getKeyOverlay()]
+
+		if overlay_editors and not self.key_jobs:
+			# Callbacks first: if one can't be registered nothing is left half set up
+			try:
+				self.anim_callbacks.append(oma.MAnimMessage.addAnimCurveEditedCallback(self.invalidateKeys))
+				self.anim_callbacks.append(oma.MAnimMessage.addAnimKeyframeEditedCallback(self.invalidateKeys))
+			except RuntimeError:
+				for callback in self.anim_callbacks:
+					om.MMessage.removeCallback(callback)
+				self.anim_callbacks = []
+				raise
+
+			self.key_jobs.append(cmds.scriptJob(event=["timeChanged", self.timeChanged]))
+			self.key_jobs.append(cmds.scriptJob(conditionChange=["playingBack", self.timeChanged]))
+
+		elif not overlay_editors and self.key_jobs:
+			for job in self.key_jobs:
+				if cmds.scriptJob(exists=job):
+					cmds.scriptJob(kill=job)
+			for callback in self.anim_callbacks:
+				om.MMessage.removeCallback(callback)
+			self.key_jobs = []
+			self.anim_callbacks = []
+
+		self.invalidateKeys()
+
+	def invalidateKeys(self, *args):
+		self.curve_nodes = None
+		self.key_cache = {}
+		self.key_full_refresh = True
+
+		if self.key_jobs and not self.key_refresh_pending:
+			self.key_refresh_pending = True
+			QtCore.QTimer.singleShot(0, self.refreshKeys)
+
+	def getCurveNodes(self):
+		if self.curve_nodes is None:
+			self.curve_nodes = {}
+			nodes = list(self.getNodeCache())
+			existing = cmds.ls(nodes) if nodes else []
+
+			if existing:
+				# Pairs of [driven plug, anim curve] for every referenced node in one call
+				connections = cmds.listConnections(existing, source=True, destination=False, type="animCurve", connections=True) or []
+				for plug, curve in zip(connections[::2], connections[1::2]):
+					self.curve_nodes.setdefault(curve, set()).add(plug.split(".")[0])
+
+			self.animated_nodes = set().union(*self.curve_nodes.values())
+
+		return self.curve_nodes
+
+	def getKeyedNodes(self, frame):
+		if frame not in self.key_cache:
+			curve_nodes = self.getCurveNodes()
+			keyed = set()
+
+			if curve_nodes:
+				for curve in cmds.keyframe(list(curve_nodes), query=True, time=(frame, frame), name=True) or []:
+					keyed |= curve_nodes.get(curve, set())
+
+			if len(self.key_cache) > 1000:
+				self.key_cache = {}
+			self.key_cache[frame] = keyed
+
+		return self.key_cache[frame]
+
+	def timeChanged(self):
+		if not cmds.play(query=True, state=True):
+			self.refreshKeys()
+
+	def refreshKeys(self):
+		self.key_refresh_pending = False
+
+		if not self.key_jobs or cmds.play(query=True, state=True):
+			return
+
+		keyed = self.getKeyedNodes(cmds.currentTime(query=True))
+		animated = self.animated_nodes
+
+		if self.key_full_refresh:
+			for editor in self.editors:
+				if editor.getKeyOverlay():
+					editor.keyStatusFromSession(editor.buttons_list, keyed, animated)
+			self.key_full_refresh = False
+
+		else:
+			node_cache = self.getNodeCache()
+
+			affected = {}
+			for node in keyed ^ self.keyed_nodes:
+				for editor, button in node_cache.get(node, ()):
+					affected.setdefault(editor, set()).add(button)
+
+			for editor, buttons in affected.items():
+				if editor.getKeyOverlay():
+					editor.keyStatusFromSession(buttons, keyed, animated)
+
+		self.keyed_nodes = keyed
+
+
+class ButtonIndex(object):
+	gram_size = 3
+
+	def __init__(self):
+		self.grams = {}
+		self.keys = {}
+
+	def getButtonKeys(self, button):
+		keys = [sel.lower() for sel in button.getSelection()]
+
+		if button.getText():
+			keys.append(button.getText().lower())
+
+		return keys
+
+	def getGrams(self, keys):
+		grams = set()
+
+		for key in keys:
+			for size in range(1, self.gram_size + 1):
+				for i in range(len(key) - size + 1):
+					grams.add(key[i:i + size])
+
+		return grams
+
+	def setButtons(self, buttons):
+		self.grams = {}
+		self.keys = {}
+
+		for button in buttons:
+			self.addButton(button)
+
+	def addButton(self, button):
+		keys = self.getButtonKeys(button)
+		self.keys[button] = keys
+
+		for gram in self.getGrams(keys):
+			self.grams.setdefault(gram, set()).add(button)
+
+	def removeButton(self, button):
+		keys = self.keys.pop(button, None)
+
+		if keys is None:
+			return
+
+		for gram in self.getGrams(keys):
+			bucket = self.grams.get(gram)
+			if bucket is not None:
+				bucket.discard(button)
+				if not bucket:
+					del self.grams[gram]
+
+	def updateButton(self, button):
+		self.removeButton(button)
+		self.addButton(button)
+
+	def search(self, query):
+		query = query.lower()
+
+		if not query:
+			return set()
+
+		if len(query) <= self.gram_size:
+			return set(self.grams.get(query, ()))
+
+		buckets = []
+		for i in range(len(query) - self.gram_size + 1):
+			bucket = self.grams.get(query[i:i + self.gram_size])
+			if not bucket:
+				return set()
+			buckets.append(bucket)
+
+		buckets.sort(key=len)
+		candidates = buckets[0].intersection(*buckets[1:])
+
+		return set(button for button in candidates if any(query in key for key in self.keys[button]))
+
+
 class Editor(QtWidgets.QWidget):
 	def __init__(self, width, height, parent=None):
 		self.parent = parent
 		self.buttons_list = []
+		self.groups_list = []
 		self.selected_list = []
+		self.session = None
 		self.edit_mode = False
 		self.box_selection = [-1, -1, 0, 0]
 		self.edited_list = []
 
 		self.moving_buttons = False
+		self.undo_stack = []
+		self.lasso_points = []
+
+		self.snapping = True
+		self.grid_size = 10
+		self.snap_threshold = 5
+		self.snap_index = None
+		self.snap_start_bounds = None
+		self.snap_press = (0, 0)
+		self.snap_guides = []
+
+		self.key_overlay = False
+		self.key_status = {}
+
+		self.button_index = ButtonIndex()
+		self.search_text = ""
+		self.search_matches = set()
+
+		self.drag_button = None
+		self.drag_origin = 0
+
+		self.mirror_token_map = {}
+		self.setMirrorTokenMap({"_lf_": "_rt_", "_rt_": "_lf_", "_l_": "_r_", "_r_": "_l_", "Left": "Right", "Right": "Left"})
 
 		super(Editor, self).__init__()
 
@@ -147,22 +553,58 @@ class Editor(QtWidgets.QWidget):
 		self.resize(width, height)
 
 		self.bg_image = ""
+		self.picker_path = ""
+		self.scene_picker = ""
+
+		self.drag_timer = QtCore.QTimer(self)
+		self.drag_timer.setSingleShot(True)
+		self.drag_timer.timeout.connect(self.flushDrag)
+
+		self.threaded_render = False
+		self.renderer = None
+		self.renderer_guard = None
+		self.front_frame = None
+		self.frame_timer = QtCore.QTimer(self)
+		self.frame_timer.setSingleShot(True)
+		self.frame_timer.setInterval(0)
+		self.frame_timer.timeout.connect(self.sendFrameRequest)
+
+		self.picker_mtime = None
+		self.file_watcher = QtCore.QFileSystemWatcher(self)
+		self.file_watcher.fileChanged.connect(self.pickerFileChanged)
+		self.reload_timer = QtCore.QTimer(self)
+		self.reload_timer.setSingleShot(True)
+		self.reload_timer.setInterval(200)
+		self.reload_timer.timeout.connect(self.reloadPicker)
+		self.loader_signals = PickerLoaderSignals(self)
+		self.loader_signals.loaded.connect(self.mergePicker)
 
 	def mousePressEvent(self, e):
 		if e.button() == QtCore.Qt.MouseButton.LeftButton:
 			self.setFocus()
 			not_selected = True
 
+			if not self.edit_mode:
+				for button in reversed(self.buttons_list):
+					if button.isDraggable() and button.isOnButton(e.x(), e.y()):
+						self.startDrag(button, e.x())
+						return
+
+			elif e.modifiers() == QtCore.Qt.AltModifier:
+				self.lasso_points = [(e.x(), e.y())]
+				return
+
 			start_box = True
 			if self.edit_mode:
 				self.edited_list = []
 				reset_selection = True
 
+				hits = set(self.getButtonsAt(e.x(), e.y()))
+
 				if self.selected_list:
-					for button in self.buttons_list:
-						if button.isOnButton(e.x(), e.y()):
-							if button.getSelected():
-								reset_selection = False
+					for button in hits:
+						if button.getSelected():
+							reset_selection = False
 
 				for button in reversed(self.buttons_list):
 					button.setEditOffset((button.getPosX() - e.x(), button.getPosY() - e.y()))
@@ -174,7 +616,7 @@ class Editor(QtWidgets.QWidget):
 							if button.getSelected():
 								self.edited_list.append(button)
 
-						if button.isOnButton(e.x(), e.y()):
+						if button in hits:
 							self.selectButton(button)
 							start_box = False
 
@@ -183,11 +625,30 @@ class Editor(QtWidgets.QWidget):
 								self.edited_list.append(button)
 								not_selected = False
 
+				for button in self.expandGroupSelection():
+					if button not in self.edited_list:
+						self.edited_list.append(button)
+
+				if self.edited_list and self.snapping:
+					self.startSnapping(e.x(), e.y())
+
 			if start_box:
 				self.box_selection[0] = e.x()
 				self.box_selection[1] = e.y()
 
 	def mouseReleaseEvent(self, e):
+		if self.drag_button:
+			if e.button() == QtCore.Qt.MouseButton.LeftButton:
+				self.endDrag()
+			return
+
+		if self.lasso_points:
+			if len(self.lasso_points) > 2:
+				self.addFreeformButton(self.lasso_points, cmds.ls(sl=True) or [])
+			self.lasso_points = []
+			self.repaint()
+			return
+
 		if e.button() == QtCore.Qt.MouseButton.LeftButton:
 			if self.edit_mode:
 				if self.edited_list:
@@ -209,14 +670,15 @@ class Editor(QtWidgets.QWidget):
 
 							self.repaint()
 
-			self.updateSelectMode(e)
-
-		if self.box_selection[:1] != [-1, -1]:
-			if not self.edited_list:
-				if (self.box_selection[2] ** 2 + self.box_selection[3] ** 2) ** 0.5 > 2:
-					self.boxSelect()
+			if (self.box_selection[2] ** 2 + self.box_selection[3] ** 2) ** 0.5 > 2:
+				self.moving_buttons = False
+				self.boxSelect(e.modifiers())
+			else:
+				self.updateSelectMode(e)
 
 		self.box_selection = [-1, -1, 0, 0]
+		self.snap_index = None
+		self.snap_guides = []
 		self.repaint()
 
 		if len(self.selected_list) == 1:
@@ -228,13 +690,31 @@ class Editor(QtWidgets.QWidget):
 			self.parent.name_textfield.setEnabled(False)
 
 	def mouseMoveEvent(self, e):
+		if self.drag_button:
+			self.drag_button.dragTo(e.x() - self.drag_origin)
+			if not self.drag_timer.isActive():
+				self.drag_timer.start()
+			return
+
+		if self.lasso_points:
+			last_x, last_y = self.lasso_points[-1]
+			if abs(e.x() - last_x) + abs(e.y() - last_y) > 4:
+				self.lasso_points.append((e.x(), e.y()))
+				self.repaint()
+			return
+
 		repaint = False
 
 		if self.edit_mode:
 			self.moving_buttons = True
-			for button in self.edited_list:
-				button.setPosX(e.x() + button.getEditOffset()[0])
-				button.setPosY(e.y() + button.getEditOffset()[1])
+			if self.edited_list:
+				first_button = self.edited_list[0]
+				snap_x, snap_y = self.getSnapCorrection(e)
+				offset_x = e.x() + first_button.getEditOffset()[0] + snap_x - first_button.getPosX()
+				offset_y = e.y() + first_button.getEditOffset()[1] + snap_y - first_button.getPosY()
+
+				for item in self.getRootItems(self.edited_list):
+					item.moveBy(offset_x, offset_y)
 				repaint = True
 
 		if self.box_selection[:1] != [-1, -1]:
@@ -248,6 +728,9 @@ class Editor(QtWidgets.QWidget):
 
 	def keyPressEvent(self, e):
 		if e.key() == QtCore.Qt.Key_Delete:
+			removed = self.selected_list
+			self.removeFromGroups(removed)
+
 			if self.edit_mode:
 				for button in self.selected_list:
 					self.buttons_list.remove(button)
@@ -258,6 +741,8 @@ class Editor(QtWidgets.QWidget):
 					self.buttons_list.remove(button)
 				self.selected_list = []
 
+			self.buttonsChanged(removed=removed)
+
 			self.parent.name_textfield.setText("")
 			self.parent.name_textfield.setEnabled(False)
 
@@ -283,20 +768,73 @@ class Editor(QtWidgets.QWidget):
 			if self.edit_mode:
 				self.align()
 
+		elif e.key() == QtCore.Qt.Key_M:
+			if self.edit_mode:
+				if e.modifiers() == QtCore.Qt.ShiftModifier:
+					self.mirrorButtons("y")
+				else:
+					self.mirrorButtons("x")
+
+		elif e.key() == QtCore.Qt.Key_Z:
+			# Outside of edit mode Ctrl+Z belongs to Maya's own undo queue
+			if self.edit_mode and e.modifiers() == QtCore.Qt.ControlModifier:
+				self.undo()
+			else:
+				e.ignore()
+
+		elif e.key() == QtCore.Qt.Key_P:
+			if self.edit_mode and e.modifiers() == QtCore.Qt.ControlModifier:
+				self.capturePoses()
+
+		elif e.key() == QtCore.Qt.Key_G:
+			if self.edit_mode:
+				if e.modifiers() == QtCore.Qt.ControlModifier:
+					self.groupSelected()
+				elif e.modifiers() == QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier:
+					self.ungroupSelected()
+				self.repaint()
+
+		elif e.key() == QtCore.Qt.Key_H:
+			if e.modifiers() == QtCore.Qt.ControlModifier:
+				self.setSelectedGroupsVisible(False)
+			elif e.modifiers() == QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier:
+				self.showAllGroups()
+
 		elif e.key() == QtCore.Qt.Key_S:
 			if e.modifiers() == QtCore.Qt.ControlModifier:
 				save_path = QtWidgets.QFileDialog.getSaveFileName(caption="Save picker", filter="*.pik")[0]
 
 				self.savePicker(save_path)
 
+			elif e.modifiers() == QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier:
+				name, validate = QtWidgets.QInputDialog.getText(self, "Store picker in scene", "Picker name", text=self.scene_picker or "picker")
+
+				if validate:
+					self.storeScenePicker(name)
+
 		elif e.key() == QtCore.Qt.Key_O:
 			if e.modifiers() == QtCore.Qt.ControlModifier:
 				file_path = QtWidgets.QFileDialog.getOpenFileName(caption="Load picker", filter="*.pik")[0]
 
 				self.loadPicker(file_path)
 
+			elif e.modifiers() == QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier:
+				names = sorted(getScenePickerIndex())
+
+				if names:
+					name, validate = QtWidgets.QInputDialog.getItem(self, "Load picker from scene", "Picker", names, 0, False)
+
+					if validate:
+						self.loadScenePicker(name)
+				else:
+					cmds.warning("Martopicker: no picker stored in this scene")
+
 	def toggleEditMode(self):
 		self.edit_mode = not self.edit_mode
+
+		if not self.edit_mode:
+			self.selectionFromViewport()
+
 		self.repaint()
 
 	def paintEvent(self, e):
@@ -304,77 +842,491 @@ class Editor(QtWidgets.QWidget):
 		qp.begin(self)
 		qp.setRenderHint(QtGui.QPainter.Antialiasing, True)
 
-		if self.bg_image:
-			qp.drawPixmap(self.bg_scaled_pixmap.rect(), self.bg_scaled_pixmap)
+		background = self.bg_scaled_pixmap if self.bg_image else None
+		draw_grid = self.edit_mode and self.snapping
 
-		for button in self.buttons_list:
-			button.draw(qp, self.edit_mode)
+		if self.threaded_render and self.front_frame is not None:
+			drawPicker(qp, background, [], self.edit_mode)
+			if draw_grid:
+				self.drawGrid(qp)
+			qp.drawImage(0, 0, self.front_frame)
+
+		else:
+			buttons = self.getVisibleButtons(QtCore.QRectF(e.rect()))
+
+			if draw_grid:
+				drawPicker(qp, background, [], self.edit_mode)
+				self.drawGrid(qp)
+				drawPicker(qp, None, buttons, self.edit_mode)
+			else:
+				drawPicker(qp, background, buttons, self.edit_mode)
+
+		if self.search_matches:
+			self.drawSearchMatches(qp)
+
+		if self.snap_guides:
+			self.drawSnapGuides(qp)
+
+		if self.key_overlay:
+			self.drawKeyOverlay(qp)
 
 		if self.box_selection[:1] != [-1, -1]:
 			qp.setPen(QtGui.QColor(184, 184, 255, 50))
 			qp.setBrush(QtGui.QColor(184, 184, 255, 50))
 			qp.drawRect(self.box_selection[0], self.box_selection[1], self.box_selection[2], self.box_selection[3])
 
+		if self.lasso_points:
+			qp.setPen(QtGui.QColor(184, 184, 255))
+			qp.setBrush(QtCore.Qt.NoBrush)
+			qp.drawPolyline(QtGui.QPolygonF([QtCore.QPointF(x, y) for x, y in self.lasso_points]))
+
 		qp.end()
 
-	def updateSelectMode(self, e):
-		select = []
+	def getVisibleButtons(self, rect):
+		if self.groups_list:
+			culled = self.getCulledButtons(rect)
+			if culled:
+				return [button for button in self.buttons_list if button not in culled]
+		return self.buttons_list
+
+	def setThreadedRender(self, threaded_render):
+		if threaded_render and self.renderer is None:
+			# Not parented to the editor: destroying a running QThread aborts Maya,
+			# so the thread is stopped from the editor's destroyed signal instead
+			renderer = PickerRenderer()
+			renderer.frame_ready.connect(self.frameReady)
+			self.renderer_guard = lambda *args: renderer.stop()
+			self.destroyed.connect(self.renderer_guard)
+			self.renderer = renderer
+			self.renderer.start()
+
+		elif not threaded_render and self.renderer is not None:
+			self.frame_timer.stop()
+			self.destroyed.disconnect(self.renderer_guard)
+			self.renderer_guard = None
+			self.renderer.stop()
+			self.renderer = None
+			self.front_frame = None
+
+		self.threaded_render = threaded_render
+		self.repaint()
+
+	def requestFrame(self):
+		# Every update() call in one event loop pass shares a single snapshot
+		if not self.frame_timer.isActive():
+			self.frame_timer.start()
+
+	def sendFrameRequest(self):
+		if self.renderer is None:
+			return
+
+		# Buttons keep changing on this thread, so the renderer gets shallow copies
+		buttons = [copy.copy(button) for button in self.getVisibleButtons(QtCore.QRectF(self.rect()))]
+		self.renderer.requestFrame((buttons, self.width(), self.height(), self.devicePixelRatioF(), self.edit_mode))
+
+	def frameReady(self, image):
+		if self.threaded_render:
+			self.front_frame = image
+			super(Editor, self).update()
+
+	def repaint(self, *args):
+		if self.threaded_render:
+			self.requestFrame()
+		else:
+			super(Editor, self).repaint(*args)
+
+	def update(self, *args):
+		if self.threaded_render:
+			self.requestFrame()
+		else:
+			super(Editor, self).update(*args)
+
+	def resizeEvent(self, e):
+		super(Editor, self).resizeEvent(e)
+
+		if self.threaded_render:
+			self.requestFrame()
+
+	def setSnapping(self, snapping):
+		self.snapping = snapping
+		self.repaint()
+
+	def startSnapping(self, press_x, press_y):
+		self.snap_press = (press_x, press_y)
+
+		moving = set(self.edited_list)
+		self.snap_index = SnapIndex([button for button in self.buttons_list if button not in moving and button.isVisible()])
+
+		bounds = QtCore.QRectF()
+		for button in self.edited_list:
+			bounds = bounds.united(button.getBounds())
+		self.snap_start_bounds = bounds
+
+	def getSnapCorrection(self, e):
+		self.snap_guides = []
+
+		if self.snap_index is None or e.modifiers() == QtCore.Qt.AltModifier:
+			return 0, 0
+
+		bounds = self.snap_start_bounds.translated(e.x() - self.snap_press[0], e.y() - self.snap_press[1])
+
+		snap_x, guide_x = self.snap_index.snapX((bounds.left(), bounds.center().x(), bounds.right()), self.snap_threshold)
+		snap_y, guide_y = self.snap_index.snapY((bounds.top(), bounds.center().y(), bounds.bottom()), self.snap_threshold)
+
+		if guide_x is not None:
+			self.snap_guides.append(("x", guide_x))
+		else:
+			snap_x = round(bounds.center().x() / self.grid_size) * self.grid_size - bounds.center().x()
+
+		if guide_y is not None:
+			self.snap_guides.append(("y", guide_y))
+		else:
+			snap_y = round(bounds.center().y() / self.grid_size) * self.grid_size - bounds.center().y()
+
+		return snap_x, snap_y
+
+	def drawGrid(self, qp):
+		qp.setPen(QtGui.QColor(255, 255, 255, 15))
+
+		for x in range(0, self.width(), self.grid_size):
+			qp.drawLine(x, 0, x, self.height())
+		for y in range(0, self.height(), self.grid_size):
+			qp.drawLine(0, y, self.width(), y)
 
+	def drawSnapGuides(self, qp):
+		pen = QtGui.QPen(QtGui.QColor(255, 90, 200))
+		pen.setStyle(QtCore.Qt.DashLine)
+		qp.setPen(pen)
+
+		for axis, value in self.snap_guides:
+			if axis == "x":
+				qp.drawLine(QtCore.QPointF(value, 0), QtCore.QPointF(value, self.height()))
+			else:
+				qp.drawLine(QtCore.QPointF(0, value), QtCore.QPointF(self.width(), value))
+
+	def updateSelectMode(self, e):
 		if self.moving_buttons:
 			self.moving_buttons = False
-		else:
+		elif self.edit_mode:
+			hits = self.getButtonsAt(e.x(), e.y())
 			for button in self.buttons_list:
 				self.deselectButton(button)
-				if button.isOnButton(e.x(), e.y()):
-					self.selectButton(button)
-					for sel in button.getSelection():
-						if cmds.objExists(sel):
-							select.append(sel)
-
-		if not self.edit_mode:
-			cmds.select(select)
+			for button in hits:
+				self.selectButton(button)
+			self.expandGroupSelection()
+		else:
+			self.applyPickerSelection(self.getButtonsAt(e.x(), e.y()), self.getSelectMode(e.modifiers()))
 
 		self.repaint()
 
-	def boxSelect(self):
-		select = []
+	def getSelectMode(self, modifiers):
+		if modifiers == QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier:
+			return "add"
+		elif modifiers == QtCore.Qt.ShiftModifier:
+			return "toggle"
+		elif modifiers == QtCore.Qt.ControlModifier:
+			return "subtract"
+		return "replace"
+
+	def applyPickerSelection(self, buttons, mode):
+		nodes = []
+		for button in buttons:
+			if button.getScript():
+				button.executeScript()
+			else:
+				nodes.extend(button.getSelection())
+
+		existing = set(cmds.ls(nodes) or []) if nodes else set()
+		nodes = set(node for node in nodes if node in existing)
+
+		if self.session:
+			current = self.session.getViewportSelection()
+		else:
+			current = set(cmds.ls(sl=True) or [])
+
+		if mode == "add":
+			target = current | nodes
+		elif mode == "subtract":
+			target = current - nodes
+		elif mode == "toggle":
+			target = current ^ nodes
+		else:
+			target = nodes
+
+		# Toggling exactly the nodes that differ turns the current selection into the target in one call
+		changed = target ^ current
+		if changed:
+			cmds.select(list(changed), toggle=True)
+
+		if self.session:
+			self.session.applySelection(target)
+		else:
+			self.selectionFromViewport()
 
+	def boxSelect(self, modifiers):
 		box_x_min = min((self.box_selection[0], self.box_selection[0] + self.box_selection[2]))
 		box_x_max = max((self.box_selection[0], self.box_selection[0] + self.box_selection[2]))
 		box_y_min = min((self.box_selection[1], self.box_selection[1] + self.box_selection[3]))
 		box_y_max = max((self.box_selection[1], self.box_selection[1] + self.box_selection[3]))
 		
+		buttons = self.getButtonsIn(QtCore.QRectF(box_x_min, box_y_min, box_x_max - box_x_min, box_y_max - box_y_min))
+
+		if self.edit_mode:
+			for button in self.buttons_list:
+				self.deselectButton(button)
+			for button in buttons:
+				self.selectButton(button)
+			self.expandGroupSelection()
+		else:
+			self.applyPickerSelection(buttons, self.getSelectMode(modifiers))
+
+	def getButtonsAt(self, x, y):
+		hits = []
+
+		for group in self.groups_list:
+			group.collectButtonsAt(x, y, hits)
+
+		for button in self.buttons_list:
+			if button.getGroup() is None and button.isOnButton(x, y):
+				hits.append(button)
+
+		return hits
+
+	def getButtonsIn(self, rect):
+		hits = []
+
+		for group in self.groups_list:
+			group.collectButtonsIn(rect, hits)
+
 		for button in self.buttons_list:
+			if button.getGroup() is None and button.getBounds().intersects(rect):
+				hits.append(button)
+
+		return hits
+
+	def getCulledButtons(self, rect):
+		culled = set()
+
+		for group in self.groups_list:
+			group.collectCulled(rect, culled)
+
+		return culled
+
+	def getRootItems(self, buttons):
+		roots = []
+		root_set = set()
+		buttons_set = set(buttons)
+
+		for button in buttons:
+			root = button.getRootGroup() or button
+			if root in root_set:
+				continue
+			root_set.add(root)
+
+			if root is button or all(member in buttons_set for member in root.getButtons()):
+				roots.append(root)
+			else:
+				for member in root.getButtons():
+					if member in buttons_set:
+						roots.append(member)
+
+		return roots
+
+	def expandGroupSelection(self):
+		added = []
+
+		for root in self.getRootItems(self.selected_list):
+			if isinstance(root, ButtonGroup):
+				for button in root.getButtons():
+					if not button.getSelected():
+						self.selectButton(button)
+						added.append(button)
+
+		return added
+
+	def groupSelected(self):
+		roots = []
+		for button in self.selected_list:
+			root = button.getRootGroup() or button
+			if root not in roots:
+				roots.append(root)
+
+		if len(roots) < 2:
+			return
+
+		for root in roots:
+			if root in self.groups_list:
+				self.groups_list.remove(root)
+
+		self.groups_list.append(ButtonGroup(roots))
+
+	def ungroupSelected(self):
+		roots = []
+		for button in self.selected_list:
+			root = button.getRootGroup()
+			if root is not None and root not in roots:
+				roots.append(root)
+
+		for root in roots:
+			self.groups_list.remove(root)
+			for member in root.ungroup():
+				if isinstance(member, ButtonGroup):
+					self.groups_list.append(member)
+
+	def setSelectedGroupsVisible(self, visible):
+		for root in self.getRootItems(self.selected_list):
+			if isinstance(root, ButtonGroup):
+				root.setVisible(visible)
+				self.deselectButtons(root.getButtons())
+		self.repaint()
+
+	def showAllGroups(self):
+		for group in self.groups_list:
+			group.setVisible(True)
+		self.repaint()
+
+	def deselectButtons(self, buttons):
+		for button in buttons:
 			self.deselectButton(button)
-			if button.getPosX() + button.getRadiusX()/2 > box_x_min:
-				if button.getPosX() - button.getRadiusX()/2 < box_x_max:
-					if button.getPosY() + button.getRadiusY()/2 > box_y_min:
-						if button.getPosY() - button.getRadiusY()/2 < box_y_max:
-							self.selectButton(button)
-							for sel in button.getSelection():
-								if cmds.objExists(sel):
-									select.append(sel)
 
-		if not self.edit_mode:
-			cmds.select(select)
+	def removeFromGroups(self, buttons):
+		for button in buttons:
+			group = button.getGroup()
+			while group is not None:
+				parent_group = group.getGroup()
+				group.removeMember(button)
+				if group.getMembers():
+					break
+				if group in self.groups_list:
+					self.groups_list.remove(group)
+				button = group
+				group = parent_group
 
 	def selectionFromViewport(self):
 		if not self.edit_mode:
-			viewport_selection = cmds.ls(sl=True)
+			if self.session:
+				viewport_selection = self.session.getViewportSelection()
+			else:
+				viewport_selection = set(cmds.ls(sl=True) or [])
 
 			for button in self.buttons_list:
-				valid_sel = True
-				if button.getSelection():
-					for sel in button.getSelection():
-						if sel not in viewport_selection:
-							valid_sel = False
+				self.updateButtonFromSelection(button, viewport_selection)
 
-					if valid_sel:
-						self.selectButton(button)
-					else:
-						self.deselectButton(button)
+			self.repaint()
 
+	def selectionFromSession(self, buttons, viewport_selection):
+		if not self.edit_mode:
+			for button in buttons:
+				self.updateButtonFromSelection(button, viewport_selection)
+				self.update(button.getBoundingRect())
+
+	def updateButtonFromSelection(self, button, viewport_selection):
+		if button.getSelection():
+			valid_sel = True
+			for sel in button.getSelection():
+				if sel not in viewport_selection:
+					valid_sel = False
+					break
+
+			if valid_sel:
+				self.selectButton(button)
+			else:
+				self.deselectButton(button)
+
+	def drawKeyOverlay(self, qp):
+		qp.setPen(QtGui.QColor(10, 10, 10))
+
+		for button, status in self.key_status.items():
+			if status == "key":
+				qp.setBrush(QtGui.QColor(220, 40, 40))
+			else:
+				qp.setBrush(QtGui.QColor(240, 170, 60))
+
+			qp.drawEllipse(QtCore.QPointF(button.getPosX() + button.getRadiusX()/2, button.getPosY() - button.getRadiusY()/2), 3, 3)
+
+	def keyStatusFromSession(self, buttons, keyed, animated):
+		for button in buttons:
+			status = None
+			for sel in button.getSelection():
+				if sel in keyed:
+					status = "key"
+					break
+				elif sel in animated:
+					status = "anim"
+
+			if status:
+				self.key_status[button] = status
+			else:
+				self.key_status.pop(button, None)
+
+			self.update(button.getBoundingRect().adjusted(-4, -4, 4, 4))
+
+	def setKeyOverlay(self, key_overlay):
+		self.key_overlay = key_overlay
+		self.key_status = {}
+
+		if self.session:
+			self.session.keyOverlayChanged()
+
+		self.repaint()
+
+	def getKeyOverlay(self):
+		return self.key_overlay
+
+	def setSession(self, session):
+		self.session = session
+
+	def buttonsChanged(self, added=None, removed=None):
+		if added is None and removed is None:
+			self.button_index.setButtons(self.buttons_list)
+		else:
+			for button in added or []:
+				self.button_index.addButton(button)
+			for button in removed or []:
+				self.button_index.removeButton(button)
+
+		self.refreshSearch()
+
+		self.key_status = {}
+
+		if self.session:
+			self.session.invalidate()
+
+	def setSearchText(self, text):
+		self.search_text = text
+		self.refreshSearch()
+
+	def refreshSearch(self):
+		matches = self.button_index.search(self.search_text)
+
+		for button in matches ^ self.search_matches:
+			self.update(button.getBoundingRect().adjusted(-3, -3, 3, 3))
+
+		self.search_matches = matches
+
+	def selectSearchMatches(self):
+		if not self.search_matches:
+			return
+
+		if self.edit_mode:
+			for button in self.search_matches:
+				self.selectButton(button)
 			self.repaint()
+		else:
+			nodes = set()
+			for button in self.search_matches:
+				nodes.update(button.getSelection())
+
+			existing = cmds.ls(list(nodes)) if nodes else []
+			if existing:
+				cmds.select(existing)
+
+	def drawSearchMatches(self, qp):
+		qp.setPen(QtGui.QPen(QtGui.QColor(80, 220, 255), 2))
+		qp.setBrush(QtCore.Qt.NoBrush)
+
+		for button in self.search_matches:
+			qp.drawRect(button.getBoundingRect().adjusted(-1, -1, 1, 1))
 
 	def getEditMode(self):
 		return self.edit_mode
@@ -383,8 +1335,8 @@ class Editor(QtWidgets.QWidget):
 		return self.selected_list
 
 	def setButtonColor(self, color):
-		for button in self.selected_list:
-			button.setColor(color)
+		for item in self.getRootItems(self.selected_list):
+			item.setColor(color)
 		self.repaint()
 
 	def setButtonSizeOffset(self, size):
@@ -392,8 +1344,30 @@ class Editor(QtWidgets.QWidget):
 			button.setSize(size)
 		self.repaint()
 
+	def setButtonShape(self, shape):
+		for button in self.selected_list:
+			button.setShape(shape)
+		self.repaint()
+
+	def setButtonSvgShape(self, svg_path):
+		try:
+			shape_data = loadSvgShape(svg_path)
+		except ValueError as error:
+			cmds.warning("Martopicker: cannot import {}: {}".format(svg_path, error))
+			return
+
+		if not shape_data:
+			cmds.warning("Martopicker: no usable path found in " + svg_path)
+			return
+
+		for button in self.selected_list:
+			button.setShape("svg", shape_data)
+		self.repaint()
+
 	def setButtonName(self, name):
 		self.selected_list[0].setText(name)
+		self.button_index.updateButton(self.selected_list[0])
+		self.refreshSearch()
 		self.repaint()
 
 	def selectButton(self, button):
@@ -410,256 +1384,1612 @@ class Editor(QtWidgets.QWidget):
 			self.selected_list.remove(button)
 
 	def setBackgroundImage(self, image_path):
+		bg_pixmap = QtGui.QPixmap(image_path)
+		self.setBackgroundPixmap(image_path, bg_pixmap.scaledToWidth(600))
+
+	def setBackgroundPixmap(self, image_path, scaled_pixmap):
 		self.bg_image = image_path
-		bg_pixmap = QtGui.QPixmap(self.bg_image)
-		self.bg_scaled_pixmap = bg_pixmap.scaledToWidth(600)
+		self.bg_scaled_pixmap = scaled_pixmap
 		self.setMinimumSize(self.bg_scaled_pixmap.width(), self.bg_scaled_pixmap.height())
 		self.resize(self.bg_scaled_pixmap.width(), self.bg_scaled_pixmap.height())
 
+	def getPickerData(self):
+		return {"buttons": self.buttons_list, "groups": self.groups_list, "background": self.bg_image, "mirror_tokens": self.mirror_token_map}
+
+	def setPickerData(self, data):
+		self.buttons_list = data["buttons"]
+		self.groups_list = data.get("groups", [])
+		self.selected_list = []
+		self.undo_stack = []
+		self.buttonsChanged()
+		if "mirror_tokens" in data:
+			self.setMirrorTokenMap(data["mirror_tokens"])
+
+	def setPickerPath(self, path):
+		if self.picker_path and self.picker_path != path:
+			forgetPicker(self.picker_path)
+
+		if self.file_watcher.files():
+			self.file_watcher.removePaths(self.file_watcher.files())
+
+		self.picker_path = path
+		self.picker_mtime = None
+
+		if path:
+			rememberPicker(path)
+			self.picker_mtime = os.path.getmtime(path)
+			self.file_watcher.addPath(path)
+
+	def pickerFileChanged(self, path):
+		# Editors often save by replacing the file, so changes are debounced
+		# and the path is watched again once the new file exists
+		self.reload_timer.start()
+
+	def reloadPicker(self):
+		path = self.picker_path
+
+		if not path or not os.path.isfile(path):
+			return
+
+		if path not in self.file_watcher.files():
+			self.file_watcher.addPath(path)
+
+		mtime = os.path.getmtime(path)
+		if mtime == self.picker_mtime:
+			return
+
+		self.picker_mtime = mtime
+		QtCore.QThreadPool.globalInstance().start(PickerLoader(path, self.loader_signals))
+
+	def mergePicker(self, path, data):
+		if path != self.picker_path or not data:
+			return
+
+		if self.drag_button:
+			self.picker_mtime = None
+			self.reload_timer.start()
+			return
+
+		old_buttons = {}
+		for button in self.buttons_list:
+			old_buttons[button.getButtonId()] = button
+
+		buttons_list = []
+		added = []
+		changed = []
+		region = QtGui.QRegion()
+
+		for new_button in data["buttons"]:
+			button = old_buttons.pop(new_button.getButtonId(), None)
+
+			if button is None or type(button) is not type(new_button):
+				if button is not None:
+					old_buttons[button.getButtonId()] = button
+				buttons_list.append(new_button)
+				added.append(new_button)
+				region += new_button.getBoundingRect()
+
+			else:
+				if button.differsFrom(new_button):
+					region += button.getBoundingRect()
+					button.updateFrom(new_button)
+					region += button.getBoundingRect()
+					changed.append(button)
+				buttons_list.append(button)
+
+		removed = list(old_buttons.values())
+		for button in removed:
+			region += button.getBoundingRect()
+			self.key_status.pop(button, None)
+
+		groups_signature = [group.getSignature() for group in self.groups_list]
+
+		buttons_by_id = {}
+		for button in buttons_list:
+			button.setGroup(None)
+			buttons_by_id[button.getButtonId()] = button
+
+		self.groups_list = data.get("groups", [])
+		for group in self.groups_list:
+			group.remapButtons(buttons_by_id)
+
+		if groups_signature != [group.getSignature() for group in self.groups_list]:
+			region += self.rect()
+
+		if not added and not removed and not changed and region.isEmpty() and data["background"] == self.bg_image:
+			return
+
+		self.buttons_list = buttons_list
+		self.selected_list = [button for button in self.selected_list if button not in removed]
+		self.edited_list = []
+		self.undo_stack = []
+
+		for button in changed:
+			self.button_index.updateButton(button)
+		self.buttonsChanged(added=added, removed=removed)
+
+		if "mirror_tokens" in data:
+			self.setMirrorTokenMap(data["mirror_tokens"])
+
+		if data["background"] != self.bg_image:
+			self.setBackgroundImage(data["background"])
+			self.update()
+		else:
+			self.update(region)
+
+		self.writePickerCache()
+
+	def getPickerPath(self):
+		return self.picker_path
+
 	def savePicker(self, path):
 		if path:
 			if os.path.splitext(path)[1] == ".pik":
-				data = {"buttons": self.buttons_list, "background": self.bg_image}
 				with open(path, "wb") as file:
-					pickle.dump(data, file)
+					pickle.dump(self.getPickerData(), file)
+
+				self.setPickerPath(path)
+				self.writePickerCache()
 
 	def loadPicker(self, path):
 		if path:
 			if os.path.splitext(path)[1] == ".pik":
-				with open(path, "rb") as file:
-					data = pickle.load(file)
-					self.buttons_list = data["buttons"]
-					self.setBackgroundImage(data["background"])
-					self.repaint()
+				if not self.loadPickerCache(path):
+					with open(path, "rb") as file:
+						data = pickle.load(file)
+						self.setPickerData(data)
+						self.setBackgroundImage(data["background"])
+
+					self.setPickerPath(path)
+					self.writePickerCache()
+
+				self.repaint()
+
+	def storeScenePicker(self, name):
+		if name:
+			writeScenePicker(name, self.getPickerData())
+			self.scene_picker = name
+
+	def loadScenePicker(self, name):
+		data = readScenePicker(name)
+
+		if data:
+			self.setPickerData(data)
+			self.setBackgroundImage(data["background"])
+			self.setPickerPath("")
+			self.scene_picker = name
+			self.repaint()
+
+	def writePickerCache(self):
+		if not self.picker_path:
+			return
+
+		data = self.getPickerData()
+		data["buttons"] = packPickerButtons(self.buttons_list, self.groups_list)
+		del data["groups"]
+		data["version"] = PICKER_CACHE_VERSION
+		data["mtime"] = os.path.getmtime(self.picker_path)
+		data["background_mtime"] = None
+		data["background_image"] = None
+
+		if self.bg_image and os.path.isfile(self.bg_image):
+			image = self.bg_scaled_pixmap.toImage().convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+			data["background_mtime"] = os.path.getmtime(self.bg_image)
+			data["background_image"] = (image.width(), image.height(), image.bytesPerLine(), bytes(image.constBits()))
+
+		with open(getPickerCachePath(self.picker_path), "wb") as file:
+			pickle.dump(data, file, pickle.HIGHEST_PROTOCOL)
+
+	def loadPickerCache(self, path):
+		cache_path = getPickerCachePath(path)
+
+		if not os.path.isfile(cache_path):
+			return False
+
+		try:
+			with open(cache_path, "rb") as file:
+				data = pickle.load(file)
+		except Exception:
+			return False
+
+		if data.get("version") != PICKER_CACHE_VERSION or data["mtime"] != os.path.getmtime(path):
+			return False
+
+		background = data["background"]
+		if background and os.path.isfile(background):
+			if data["background_image"] is None or data["background_mtime"] != os.path.getmtime(background):
+				return False
+
+		data["buttons"], data["groups"] = unpackPickerButtons(data["buttons"])
+		self.setPickerData(data)
+
+		if data["background_image"] is not None:
+			width, height, bytes_per_line, image_data = data["background_image"]
+			image = QtGui.QImage(image_data, width, height, bytes_per_line, QtGui.QImage.Format_ARGB32_Premultiplied).copy()
+			self.setBackgroundPixmap(background, QtGui.QPixmap.fromImage(image))
+		else:
+			self.setBackgroundImage(background)
+
+		self.setPickerPath(path)
+
+		return True
 
 	def generateButtonColor(self, selection):
 		name_based = False
 		position_based = True
 		color_based = False
 
-		if name_based:
-			if "_lf_" in selection:
-				return QtGui.QColor(120, 120, 255)
-			elif "_rt_" in selection:
-				return QtGui.QColor(255, 120, 120)
+		if name_based:
+			if "_lf_" in selection:
+				return QtGui.QColor(120, 120, 255)
+			elif "_rt_" in selection:
+				return QtGui.QColor(255, 120, 120)
+
+		elif position_based:
+			if cmds.xform(selection, q=True, t=True, ws=True)[0] > 0:
+				return QtGui.QColor(120, 120, 255)
+			elif cmds.xform(selection, q=True, t=True, ws=True)[0] < 0:
+				return QtGui.QColor(255, 120, 120)
+
+		return QtGui.QColor(255, 249, 23)
+
+	def setMirrorTokenMap(self, token_map):
+		self.mirror_token_map = dict(token_map)
+		tokens = sorted(self.mirror_token_map, key=len, reverse=True)
+		self.mirror_token_regex = re.compile("|".join(re.escape(token) for token in tokens)) if tokens else None
+
+	def getMirrorTokenMap(self):
+		return self.mirror_token_map
+
+	def mirrorName(self, name):
+		if self.mirror_token_regex is None:
+			return name
+		return self.mirror_token_regex.sub(lambda match: self.mirror_token_map[match.group(0)], name)
+
+	def mirrorColor(self, color):
+		left_color = QtGui.QColor(120, 120, 255)
+		right_color = QtGui.QColor(255, 120, 120)
+
+		if color == left_color:
+			return right_color
+		elif color == right_color:
+			return left_color
+		return color
+
+	def mirrorButtons(self, axis):
+		source_list = self.selected_list if self.selected_list else self.buttons_list
+
+		mirrored_names = {}
+		for button in source_list:
+			for sel in button.getSelection():
+				if sel not in mirrored_names:
+					mirrored_names[sel] = self.mirrorName(sel)
+
+		existing = set()
+		mirrored_set = set(mirrored_names.values())
+		if mirrored_set:
+			existing = set(cmds.ls(list(mirrored_set)) or [])
+
+		new_buttons = []
+		missing = set()
+
+		for button in source_list:
+			selection = button.getSelection()
+			mirrored_selection = []
+
+			for sel in selection:
+				mirrored_sel = mirrored_names[sel]
+				if mirrored_sel in existing:
+					mirrored_selection.append(mirrored_sel)
+				else:
+					missing.add(mirrored_sel)
+
+			if mirrored_selection == selection:
+				continue
+
+			if selection and not mirrored_selection:
+				continue
+
+			new_button = copy.copy(button)
+			new_button.regenerateButtonId()
+			new_button.setGroup(None)
+			new_button.deselect()
+			new_button.setSelection(mirrored_selection)
+			new_button.setColor(self.mirrorColor(button.getColor()))
+
+			if axis == "x":
+				new_button.setPosX(self.width() - button.getPosX())
+			else:
+				new_button.setPosY(self.height() - button.getPosY())
+
+			new_button.mirrorShape(axis)
+			new_button.mirrorNames(self.mirrorName)
+
+			if button.getText():
+				new_button.setText(self.mirrorName(button.getText()))
+
+			new_buttons.append(new_button)
+
+		if missing:
+			cmds.warning("Martopicker: {} mirrored nodes not found in scene: {}".format(len(missing), ", ".join(sorted(missing)[:10])))
+
+		if not new_buttons:
+			return
+
+		self.pushUndo(new_buttons)
+
+		for button in self.selected_list:
+			button.deselect()
+		self.selected_list = []
+
+		self.buttons_list.extend(new_buttons)
+		self.buttonsChanged(added=new_buttons)
+
+		for button in new_buttons:
+			self.selectButton(button)
+
+		self.repaint()
+
+	def startDrag(self, button, origin):
+		refresh_rate = 60
+		screen = QtGui.QGuiApplication.primaryScreen()
+		if screen and screen.refreshRate() > 0:
+			refresh_rate = screen.refreshRate()
+
+		self.drag_timer.setInterval(int(1000 / refresh_rate))
+
+		# Only enter drag mode once the button has read its plugs and opened its undo chunk
+		button.startDrag()
+		self.drag_button = button
+		self.drag_origin = origin
+
+	def flushDrag(self):
+		if self.drag_button:
+			self.drag_button.flushDrag()
+			self.repaint()
+
+	def endDrag(self):
+		self.drag_timer.stop()
+		try:
+			self.drag_button.endDrag()
+		finally:
+			self.drag_button = None
+			self.repaint()
+
+	def pushUndo(self, added_buttons):
+		self.undo_stack.append(list(added_buttons))
+		del self.undo_stack[:-20]
+
+	def undo(self):
+		if self.undo_stack:
+			# Only the buttons the mirror added are taken out again, so later
+			# additions, deletions and groups are kept
+			added_buttons = set(self.undo_stack.pop())
+			removed = [button for button in self.buttons_list if button in added_buttons]
+
+			self.removeFromGroups(removed)
+			self.buttons_list = [button for button in self.buttons_list if button not in added_buttons]
+			self.buttonsChanged(removed=removed)
+
+			for button in self.selected_list:
+				button.deselect()
+			self.selected_list = []
+
+			self.repaint()
+
+	def addEditorButton(self, pos, size, elem, shape, color, text, script):
+		button = EditorButton(pos[0], pos[1], size[0], size[1], elem, shape, color, text, script)
+		self.buttons_list.append(button)
+		self.buttonsChanged(added=[button])
+
+	def addFreeformButton(self, points, elem):
+		xs = [x for x, y in points]
+		ys = [y for x, y in points]
+
+		width = max(max(xs) - min(xs), 1)
+		height = max(max(ys) - min(ys), 1)
+		center_x = (max(xs) + min(xs)) / 2
+		center_y = (max(ys) + min(ys)) / 2
+
+		shape_data = [((x - center_x) / width, (y - center_y) / height) for x, y in points]
+
+		if len(elem) == 1:
+			color = self.generateButtonColor(elem[0])
+		else:
+			color = QtGui.QColor(255, 249, 23)
+
+		button = EditorButton(center_x, center_y, width, height, elem, "freeform", color, "", "")
+		button.setShape("freeform", shape_data)
+		self.buttons_list.append(button)
+		self.buttonsChanged(added=[button])
+
+	def addAttributeButton(self, pos, elem, attribute, min_value, max_value):
+		button = AttributeButton(pos[0], pos[1], 60, 14, elem, QtGui.QColor(120, 200, 120), attribute, min_value, max_value)
+		button.setText(attribute)
+		self.buttons_list.append(button)
+		self.buttonsChanged(added=[button])
+
+	def addPoseButton(self, pos, elem, name):
+		button = PoseButton(pos[0], pos[1], 40, 14, elem, QtGui.QColor(200, 150, 230))
+		button.setText(name)
+		button.capturePose()
+		self.buttons_list.append(button)
+		self.buttonsChanged(added=[button])
+
+	def capturePoses(self):
+		for button in self.selected_list:
+			if isinstance(button, PoseButton):
+				button.capturePose()
+
+	def verticalAlignMin(self):
+		min_button = self.selected_list[0]
+
+		for button in self.selected_list:
+			if button.getPosX() < min_button.getPosX():
+				min_button = button
+
+		for button in self.selected_list:
+			button.setPosX(min_button.getPosX())
+
+		self.repaint()
+
+	def verticalAlignMax(self):
+		min_button = self.selected_list[0]
+
+		for button in self.selected_list:
+			if button.getPosX() > min_button.getPosX():
+				min_button = button
+
+		for button in self.selected_list:
+			button.setPosX(min_button.getPosX())
+
+		self.repaint()
+
+	def horizontalAlignMin(self):
+		min_button = self.selected_list[0]
+
+		for button in self.selected_list:
+			if button.getPosY() < min_button.getPosY():
+				min_button = button
+
+		for button in self.selected_list:
+			button.setPosY(min_button.getPosY())
+
+		self.repaint()
+
+	def horizontalAlignMax(self):
+		min_button = self.selected_list[0]
+
+		for button in self.selected_list:
+			if button.getPosY() > min_button.getPosY():
+				min_button = button
+
+		for button in self.selected_list:
+			button.setPosY(min_button.getPosY())
+
+		self.repaint()
+
+	def align(self):
+		start_button = self.selected_list[-1]
+		end_button = self.selected_list[-2]
+
+		vec = [end_button.getPosX() - start_button.getPosX(), end_button.getPosY() - start_button.getPosY()]
+
+		intervals = len(self.selected_list) - 1
+
+		inter_vec = [vec[0] / intervals, vec[1] / intervals]
+
+		for i, button in enumerate(self.selected_list[:-2]):
+			button.setPosX(start_button.getPosX() + inter_vec[0] * (i + 1))
+			button.setPosY(start_button.getPosY() + inter_vec[1] * (i + 1))
+
+		self.repaint()
+
+
+class EditorButton():
+	def __init__(self, pos_x, pos_y, radius_x, radius_y, selection, shape, color, text, script):
+		self.pos_x = pos_x
+		self.pos_y = pos_y
+		self.default_radius_x = radius_x
+		self.radius_x = radius_x
+		self.default_radius_y = radius_y
+		self.radius_y = radius_y
+		self.size_offset = 0
+		self.edit_offset = (0, 0)
+		self.selection = selection
+		self.shape = shape
+		self.style_id = StyleTable.get().getStyleId(color)
+		self.text = text
+		self.script = script
+		self.shape_data = []
+		self.button_id = uuid.uuid4().hex
+		self.group = None
+
+		self.path = None
+		self.path_key = None
+
+		self.selected = False
+
+	def __getstate__(self):
+		# Style ids only live for the session, the color is what gets saved
+		state = self.__dict__.copy()
+		state["path"] = None
+		state["path_key"] = None
+		state["color"] = self.getColor()
+		del state["style_id"]
+		return state
+
+	def __setstate__(self, state):
+		self.shape_data = []
+		self.group = None
+		self.__dict__.update(state)
+		self.path = None
+		self.path_key = None
+
+		self.style_id = StyleTable.get().getStyleId(self.__dict__.pop("color"))
+		self.__dict__.pop("selected_color", None)
+
+		if "button_id" not in state:
+			# Pickers saved before ids existed get one derived from their content,
+			# so that reloading the same file gives the same ids
+			content = repr((self.selection, self.text, self.script, self.shape, self.pos_x, self.pos_y))
+			self.button_id = hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+	def getButtonId(self):
+		return self.button_id
+
+	def regenerateButtonId(self):
+		self.button_id = uuid.uuid4().hex
+
+	def __copy__(self):
+		# Shares the cached path instead of going through __getstate__
+		button = self.__class__.__new__(self.__class__)
+		button.__dict__.update(self.__dict__)
+		return button
+
+	def getContentState(self):
+		state = self.__getstate__()
+		state.pop("selected", None)
+		state.pop("edit_offset", None)
+		state.pop("group", None)
+		return state
+
+	def differsFrom(self, other):
+		return self.getContentState() != other.getContentState()
+
+	def updateFrom(self, other):
+		state = other.getContentState()
+		state.pop("color")
+		self.__dict__.update(state)
+		self.style_id = other.getStyleId()
+		self.path = None
+		self.invalidateGroupBounds()
+
+	def getGroup(self):
+		return self.group
+
+	def setGroup(self, group):
+		self.group = group
+
+	def getRootGroup(self):
+		root = None
+		group = self.group
+		while group is not None:
+			root = group
+			group = group.getGroup()
+		return root
+
+	def invalidateGroupBounds(self):
+		if self.group is not None:
+			self.group.invalidateBounds()
+
+	def isVisible(self):
+		return self.group is None or self.group.isVisible()
+
+	def getBounds(self):
+		return QtCore.QRectF(self.pos_x - self.radius_x/2, self.pos_y - self.radius_y/2, self.radius_x, self.radius_y)
+
+	def moveBy(self, offset_x, offset_y):
+		self.translate(offset_x, offset_y)
+		self.invalidateGroupBounds()
+
+	def translate(self, offset_x, offset_y):
+		# Leaves group bounds alone, a group moving its members translates them itself
+		self.pos_x += offset_x
+		self.pos_y += offset_y
+
+	def getPosX(self):
+		return self.pos_x
+
+	def getPosY(self):
+		return self.pos_y
+
+	def setPosX(self, pos_x):
+		self.pos_x = pos_x
+		self.invalidateGroupBounds()
+
+	def setPosY(self, pos_y):
+		self.pos_y = pos_y
+		self.invalidateGroupBounds()
+
+	def getRadiusX(self):
+		return self.radius_x
+
+	def getRadiusY(self):
+		return self.radius_y
+
+	def setEditOffset(self, edit_offset):
+		self.edit_offset = edit_offset
+
+	def getEditOffset(self):
+		return self.edit_offset
+
+	def getSelection(self):
+		return self.selection
+
+	def setSelection(self, selection):
+		self.selection = selection
+
+	def getShape(self):
+		return self.shape
+
+	def getShapeData(self):
+		return self.shape_data
+
+	def setShape(self, shape, shape_data=None):
+		self.shape = shape
+		self.shape_data = shape_data or []
+		self.path = None
+
+	def mirrorShape(self, axis):
+		if not self.shape_data:
+			return
+
+		index = 0 if axis == "x" else 1
+
+		if self.shape == "svg":
+			shape_data = []
+			for command in self.shape_data:
+				coords = list(command[1:])
+				for i in range(index, len(coords), 2):
+					coords[i] = -coords[i]
+				shape_data.append((command[0],) + tuple(coords))
+		else:
+			shape_data = []
+			for point in self.shape_data:
+				point = list(point)
+				point[index] = -point[index]
+				shape_data.append(tuple(point))
+
+		self.setShape(self.shape, shape_data)
+
+	def getPath(self):
+		key = (self.shape, self.radius_x, self.radius_y, bool(self.text))
+
+		if self.path is None or self.path_key != key:
+			self.path = buildButtonPath(self.shape, self.shape_data, self.radius_x, self.radius_y, bool(self.text))
+			self.path_key = key
+
+		return self.path
+
+	def getColor(self):
+		return self.getStyle().getFill()
+
+	def setColor(self, color):
+		self.style_id = StyleTable.get().getStyleId(color)
+
+	def getStyleId(self):
+		if self.group is not None:
+			group_style_id = self.group.getStyleId()
+			if group_style_id is not None:
+				return group_style_id
+		return self.style_id
+
+	def setStyleId(self, style_id):
+		if style_id is not None:
+			self.style_id = style_id
+
+	def getStyle(self):
+		return StyleTable.get().getStyle(self.getStyleId())
+
+	def getText(self):
+		return self.text
+
+	def setText(self, text):
+		self.text = text
+
+		if self.text:
+			fm = QtGui.QFontMetrics(self.getStyle().getFont())
+			rect = fm.boundingRect(self.text)
+
+			self.radius_x = rect.width() + 5 + self.size_offset
+			self.radius_y = rect.height() + 2 + self.size_offset
+
+		else:
+			self.radius_x = self.default_radius_x + self.size_offset
+			self.radius_y = self.default_radius_y + self.size_offset
+
+		self.invalidateGroupBounds()
+
+	def getScript(self):
+		return self.script
+
+	def getSize(self):
+		return self.size_offset
+
+	def setSize(self, size):
+		self.size_offset = size
+
+		if self.text:
+			fm = QtGui.QFontMetrics(self.getStyle().getFont())
+			rect = fm.boundingRect(self.text)
+
+			self.radius_x = rect.width() + 5 + self.size_offset
+			self.radius_y = rect.height() + 2 + self.size_offset
+
+		else:
+			self.radius_x = self.default_radius_x + self.size_offset
+			self.radius_y = self.default_radius_y + self.size_offset
+
+		self.invalidateGroupBounds()
+
+	def select(self):
+		self.selected = True
+
+	def deselect(self):
+		self.selected = False
+
+	def executeScript(self):
+		exec(self.script)
+
+	def getSelected(self):
+		return self.selected
+
+	def resetInteraction(self):
+		self.selected = False
+		self.edit_offset = (0, 0)
+
+	def isDraggable(self):
+		return False
+
+	def mirrorNames(self, mirror_name):
+		pass
+
+	def hasCustomDraw(self):
+		return False
+
+	def draw(self, qp, edit_mode):
+		self.getStyle().apply(qp, self.selected, edit_mode)
+		self.drawShape(qp)
+
+	def drawShape(self, qp):
+		size_x = self.radius_x
+		size_y = self.radius_y
+
+		qp.translate(self.pos_x, self.pos_y)
+		qp.drawPath(self.getPath())
+		qp.translate(-self.pos_x, -self.pos_y)
+
+		if self.text:
+			qp.drawText(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y, QtCore.Qt.AlignVCenter|QtCore.Qt.AlignHCenter, self.text)
+
+	def getBoundingRect(self):
+		return QtCore.QRect(int(self.pos_x - self.radius_x/2) - 2, int(self.pos_y - self.radius_y/2) - 2, int(self.radius_x) + 5, int(self.radius_y) + 5)
+
+	def isOnButton(self, x, y):
+		if self.group is not None and not self.group.isVisible():
+			return False
+
+		if x > self.pos_x - self.radius_x/2:
+			if x < self.pos_x + self.radius_x/2:
+				if y > self.pos_y - self.radius_y/2:
+					if y < self.pos_y + self.radius_y/2:
+						return self.getPath().contains(QtCore.QPointF(x - self.pos_x, y - self.pos_y))
+		return False
+
+
+class ButtonStyle(object):
+	def __init__(self, style_id, color):
+		self.style_id = style_id
+		self.fill = QtGui.QColor(color)
+		self.selected_fill = QtGui.QColor.fromHsv(self.fill.hue(), max(self.fill.saturation() - 100, 0), min(self.fill.value() + 100, 255))
+		self.pen = QtGui.QPen(QtGui.QColor(10, 10, 10))
+		self.selected_pen = QtGui.QPen(self.selected_fill)
+		self.font = QtGui.QFont()
+
+	def getStyleId(self):
+		return self.style_id
+
+	def getFill(self):
+		return self.fill
+
+	def getSelectedFill(self):
+		return self.selected_fill
+
+	def getPen(self):
+		return self.pen
+
+	def getFont(self):
+		return self.font
+
+	def apply(self, qp, selected, edit_mode):
+		if selected and edit_mode:
+			qp.setBrush(self.fill)
+			qp.setPen(self.selected_pen)
+		elif selected:
+			qp.setBrush(self.selected_fill)
+			qp.setPen(self.pen)
+		else:
+			qp.setBrush(self.fill)
+			qp.setPen(self.pen)
+
+		qp.setFont(self.font)
+
+
+class StyleTable(object):
+	instance = None
+
+	@classmethod
+	def get(cls):
+		if cls.instance is None:
+			cls.instance = StyleTable()
+		return cls.instance
+
+	def __init__(self):
+		self.styles = []
+		self.style_ids = {}
+		# Buttons are also unpickled on worker threads (live reload, thumbnails)
+		self.mutex = QtCore.QMutex()
+
+	def getStyleId(self, color):
+		key = color.rgba()
+
+		self.mutex.lock()
+		style_id = self.style_ids.get(key)
+		if style_id is None:
+			style_id = len(self.styles)
+			self.styles.append(ButtonStyle(style_id, color))
+			self.style_ids[key] = style_id
+		self.mutex.unlock()
+
+		return style_id
+
+	def getStyle(self, style_id):
+		return self.styles[style_id]
+
+
+class SnapIndex(object):
+	def __init__(self, buttons):
+		self.xs = []
+		self.ys = []
+
+		for button in buttons:
+			bounds = button.getBounds()
+			self.xs.extend((bounds.left(), bounds.center().x(), bounds.right()))
+			self.ys.extend((bounds.top(), bounds.center().y(), bounds.bottom()))
+
+		self.xs.sort()
+		self.ys.sort()
+
+	def findNearest(self, values, value, threshold):
+		i = bisect.bisect_left(values, value)
+		best = None
+
+		for j in (i - 1, i):
+			if 0 <= j < len(values):
+				distance = values[j] - value
+				if abs(distance) <= threshold and (best is None or abs(distance) < abs(best)):
+					best = distance
+
+		return best
+
+	def snap(self, values, candidates, threshold):
+		best = None
+		guide = None
+
+		for candidate in candidates:
+			distance = self.findNearest(values, candidate, threshold)
+			if distance is not None and (best is None or abs(distance) < abs(best)):
+				best = distance
+				guide = candidate + distance
+
+		return best or 0, guide
+
+	def snapX(self, candidates, threshold):
+		return self.snap(self.xs, candidates, threshold)
+
+	def snapY(self, candidates, threshold):
+		return self.snap(self.ys, candidates, threshold)
+
+
+class ButtonGroup():
+	def __init__(self, members):
+		self.members = []
+		self.group = None
+		self.visible = True
+		self.bounds = None
+		self.style_id = None
+
+		for member in members:
+			self.addMember(member)
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state["bounds"] = None
+		state["color"] = StyleTable.get().getStyle(self.style_id).getFill() if self.style_id is not None else None
+		del state["style_id"]
+		return state
+
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+
+		color = self.__dict__.pop("color", None)
+		self.style_id = StyleTable.get().getStyleId(color) if color is not None else None
+
+	def getMembers(self):
+		return self.members
+
+	def addMember(self, member):
+		member.setGroup(self)
+		self.members.append(member)
+		self.invalidateBounds()
+
+	def removeMember(self, member):
+		if member in self.members:
+			# Members leaving the group keep the color it gave them
+			style_id = member.getStyleId()
+			self.members.remove(member)
+			member.setGroup(None)
+			member.setStyleId(style_id)
+			self.invalidateBounds()
+
+	def ungroup(self):
+		members = self.members
+		for member in members:
+			style_id = member.getStyleId()
+			member.setGroup(None)
+			member.setStyleId(style_id)
+		self.members = []
+		return members
+
+	def getButtons(self):
+		buttons = []
+		for member in self.members:
+			if isinstance(member, ButtonGroup):
+				buttons.extend(member.getButtons())
+			else:
+				buttons.append(member)
+		return buttons
+
+	def getGroup(self):
+		return self.group
+
+	def setGroup(self, group):
+		self.group = group
+
+	def getRootGroup(self):
+		root = None
+		group = self.group
+		while group is not None:
+			root = group
+			group = group.getGroup()
+		return root
+
+	def isVisible(self):
+		return self.visible and (self.group is None or self.group.isVisible())
+
+	def setVisible(self, visible):
+		self.visible = visible
+
+	def invalidateBounds(self):
+		group = self
+		while group is not None and group.bounds is not None:
+			group.bounds = None
+			group = group.getGroup()
+
+	def getBounds(self):
+		if self.bounds is None:
+			bounds = QtCore.QRectF()
+			for member in self.members:
+				bounds = bounds.united(member.getBounds())
+			self.bounds = bounds
+		return self.bounds
+
+	def moveBy(self, offset_x, offset_y):
+		self.translate(offset_x, offset_y)
+
+		if self.group is not None:
+			self.group.invalidateBounds()
+
+	def translate(self, offset_x, offset_y):
+		for member in self.members:
+			member.translate(offset_x, offset_y)
+
+		if self.bounds is not None:
+			self.bounds.translate(offset_x, offset_y)
+
+	def setColor(self, color):
+		# Members fall back to the group's style, so a recolor is one change
+		self.style_id = StyleTable.get().getStyleId(color)
+
+	def getStyleId(self):
+		# Colors are set on root items, so the outermost colored group wins
+		style_id = self.style_id
+		group = self.group
+		while group is not None:
+			if group.style_id is not None:
+				style_id = group.style_id
+			group = group.getGroup()
+		return style_id
+
+	def setStyleId(self, style_id):
+		self.style_id = style_id
+
+	def collectButtonsAt(self, x, y, hits):
+		if not self.visible or not self.getBounds().contains(x, y):
+			return
+
+		for member in self.members:
+			if isinstance(member, ButtonGroup):
+				member.collectButtonsAt(x, y, hits)
+			elif member.isOnButton(x, y):
+				hits.append(member)
+
+	def collectButtonsIn(self, rect, hits):
+		if not self.visible or not self.getBounds().intersects(rect):
+			return
+
+		for member in self.members:
+			if isinstance(member, ButtonGroup):
+				member.collectButtonsIn(rect, hits)
+			elif member.getBounds().intersects(rect):
+				hits.append(member)
+
+	def collectCulled(self, rect, culled):
+		if not self.visible or not self.getBounds().adjusted(-3, -3, 3, 3).intersects(rect):
+			culled.update(self.getButtons())
+			return
+
+		for member in self.members:
+			if isinstance(member, ButtonGroup):
+				member.collectCulled(rect, culled)
+
+	def remapButtons(self, buttons_by_id):
+		for i, member in enumerate(self.members):
+			if isinstance(member, ButtonGroup):
+				member.remapButtons(buttons_by_id)
+			else:
+				button = buttons_by_id.get(member.getButtonId(), member)
+				button.setGroup(self)
+				self.members[i] = button
+		self.bounds = None
+
+	def getSignature(self):
+		signature = []
+		for member in self.members:
+			if isinstance(member, ButtonGroup):
+				signature.append(member.getSignature())
+			else:
+				signature.append(member.getButtonId())
+		return (self.visible, tuple(signature))
+
+
+class AttributeButton(EditorButton):
+	def __init__(self, pos_x, pos_y, radius_x, radius_y, selection, color, attribute, min_value, max_value):
+		super(AttributeButton, self).__init__(pos_x, pos_y, radius_x, radius_y, selection, "rect", color, "", "")
+
+		self.attribute = attribute
+		self.min_value = min_value
+		self.max_value = max_value
+		self.value = min_value
+
+		self.drag_names = []
+		self.drag_plugs = []
+		self.drag_start_values = []
+		self.drag_start_value = min_value
+		self.drag_pending = False
+		self.drag_flushed = False
+
+	def __getstate__(self):
+		state = super(AttributeButton, self).__getstate__()
+		state["drag_names"] = []
+		state["drag_plugs"] = []
+		state["drag_start_values"] = []
+		state["drag_pending"] = False
+		state["drag_flushed"] = False
+		return state
+
+	def resetInteraction(self):
+		super(AttributeButton, self).resetInteraction()
+		self.value = self.min_value
+		self.drag_start_value = self.min_value
+
+	def getAttribute(self):
+		return self.attribute
+
+	def getValue(self):
+		return self.value
+
+	def isDraggable(self):
+		return True
+
+	def startDrag(self):
+		plug_names = [sel + "." + self.attribute for sel in self.selection]
+		self.drag_names, self.drag_plugs = getPlugs(plug_names)
+		self.drag_start_values = readPlugValues(self.drag_plugs)
+
+		if self.drag_start_values:
+			self.value = self.drag_start_values[0]
+
+		self.drag_start_value = self.value
+		self.drag_pending = False
+		self.drag_flushed = False
+
+		cmds.undoInfo(openChunk=True, chunkName="Martopicker " + self.attribute)
+
+	def dragTo(self, offset):
+		value = self.drag_start_value + offset / 100 * (self.max_value - self.min_value)
+		self.value = min(max(value, self.min_value), self.max_value)
+		self.drag_pending = True
+
+	def flushDrag(self):
+		if self.drag_pending:
+			previewPlugValues(self.drag_plugs, [self.value] * len(self.drag_plugs))
+			self.drag_pending = False
+			self.drag_flushed = True
+
+	def endDrag(self):
+		try:
+			# Previews bypass the undo queue, so they are rolled back before the
+			# final value is set, even when the drag ends where it started
+			if self.drag_flushed:
+				previewPlugValues(self.drag_plugs, self.drag_start_values)
+			if self.drag_plugs and self.value != self.drag_start_value:
+				setPlugValues(self.drag_names, [self.value] * len(self.drag_names))
+		finally:
+			cmds.undoInfo(closeChunk=True)
+
+			self.drag_names = []
+			self.drag_plugs = []
+			self.drag_start_values = []
+			self.drag_pending = False
+			self.drag_flushed = False
+
+	def hasCustomDraw(self):
+		return True
+
+	def draw(self, qp, edit_mode):
+		style = self.getStyle()
+		style.apply(qp, self.selected and edit_mode, edit_mode)
+
+		size_x = self.radius_x
+		size_y = self.radius_y
+
+		qp.drawRect(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y)
+
+		value_range = self.max_value - self.min_value
+		if value_range:
+			ratio = min(max((self.value - self.min_value) / value_range, 0), 1)
+
+			qp.setPen(QtCore.Qt.NoPen)
+			qp.setBrush(style.getSelectedFill())
+			qp.drawRect(self.pos_x - size_x/2 + 1, self.pos_y - size_y/2 + 1, (size_x - 1) * ratio, size_y - 1)
+
+		if self.text:
+			qp.setPen(style.getPen())
+			qp.drawText(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y, QtCore.Qt.AlignVCenter|QtCore.Qt.AlignHCenter, self.text)
+
+
+class PoseButton(EditorButton):
+	def __init__(self, pos_x, pos_y, radius_x, radius_y, selection, color):
+		super(PoseButton, self).__init__(pos_x, pos_y, radius_x, radius_y, selection, "rect", color, "", "")
+
+		self.pose_plugs = []
+		self.pose_values = array.array("d")
+		self.blend = 1.0
+
+		self.drag_names = []
+		self.drag_plugs = []
+		self.drag_start_values = []
+		self.drag_pose_values = []
+		self.drag_pending = False
+		self.drag_flushed = False
+		self.drag_moved = False
+
+	def __getstate__(self):
+		state = super(PoseButton, self).__getstate__()
+		state["drag_names"] = []
+		state["drag_plugs"] = []
+		state["drag_start_values"] = []
+		state["drag_pose_values"] = []
+		state["drag_pending"] = False
+		state["drag_flushed"] = False
+		state["drag_moved"] = False
+		return state
+
+	def capturePose(self):
+		plug_names = []
+		for node in cmds.ls(self.selection) or []:
+			for attribute in cmds.listAttr(node, keyable=True, unlocked=True, scalar=True) or []:
+				plug_names.append(node + "." + attribute)
+
+		# Keyed channels are part of the pose, getPlugs only leaves out the
+		# ones driven by constraints or expressions
+		self.pose_plugs, plugs = getPlugs(plug_names)
+		self.pose_values = array.array("d", readPlugValues(plugs))
+
+	def resetInteraction(self):
+		super(PoseButton, self).resetInteraction()
+		self.blend = 1.0
+
+	def getPosePlugs(self):
+		return self.pose_plugs
+
+	def getPoseValues(self):
+		return self.pose_values
+
+	def mirrorNames(self, mirror_name):
+		self.pose_plugs = [mirror_name(plug) for plug in self.pose_plugs]
+		self.pose_values = array.array("d", self.pose_values)
+
+	def isDraggable(self):
+		return True
+
+	def startDrag(self):
+		pose = dict(zip(self.pose_plugs, self.pose_values))
+
+		self.drag_names, self.drag_plugs = getPlugs(self.pose_plugs)
+		self.drag_start_values = readPlugValues(self.drag_plugs)
+		self.drag_pose_values = [pose[name] for name in self.drag_names]
+		self.drag_pending = False
+		self.drag_flushed = False
+		self.drag_moved = False
+		self.blend = 0.0
+
+		cmds.undoInfo(openChunk=True, chunkName="Martopicker pose " + self.text)
+
+	def dragTo(self, offset):
+		self.blend = min(max(offset / 100, 0.0), 1.0)
+		self.drag_pending = True
+		self.drag_moved = True
+
+	def getBlendedValues(self):
+		return [start + (pose - start) * self.blend for start, pose in zip(self.drag_start_values, self.drag_pose_values)]
+
+	def flushDrag(self):
+		if self.drag_pending:
+			previewPlugValues(self.drag_plugs, self.getBlendedValues())
+			self.drag_pending = False
+			self.drag_flushed = True
+
+	def endDrag(self):
+		if not self.drag_moved:
+			self.blend = 1.0
+
+		try:
+			if self.drag_flushed:
+				previewPlugValues(self.drag_plugs, self.drag_start_values)
+			if self.drag_plugs and self.blend > 0:
+				setPlugValues(self.drag_names, self.getBlendedValues())
+		finally:
+			cmds.undoInfo(closeChunk=True)
+
+			self.drag_names = []
+			self.drag_plugs = []
+			self.drag_start_values = []
+			self.drag_pose_values = []
+			self.drag_pending = False
+			self.drag_flushed = False
+			self.drag_moved = False
+			self.blend = 1.0
+
+	def hasCustomDraw(self):
+		return True
+
+	def draw(self, qp, edit_mode):
+		super(PoseButton, self).draw(qp, edit_mode)
+
+		if self.drag_moved:
+			qp.setPen(QtCore.Qt.NoPen)
+			qp.setBrush(self.getStyle().getSelectedFill())
+			qp.drawRect(self.pos_x - self.radius_x/2, self.pos_y + self.radius_y/2 - 3, self.radius_x * self.blend, 3)
+
+
+class AttributeEditor(QtWidgets.QDialog):
+	def __init__(self, parent=None):
+		super(AttributeEditor, self).__init__(parent)
+
+		self.validate = True
+		self.attribute = ""
+
+		self.setInterface()
+		self.connectInterface()
+
+	def setInterface(self):
+		main_layout = QtWidgets.QVBoxLayout()
+
+		form_layout = QtWidgets.QFormLayout()
+
+		self.attribute_textfield = QtWidgets.QLineEdit()
+		self.min_spinbox = QtWidgets.QDoubleSpinBox()
+		self.min_spinbox.setRange(-100000, 100000)
+		self.min_spinbox.setValue(0)
+		self.max_spinbox = QtWidgets.QDoubleSpinBox()
+		self.max_spinbox.setRange(-100000, 100000)
+		self.max_spinbox.setValue(10)
+
+		form_layout.addRow("Attribute", self.attribute_textfield)
+		form_layout.addRow("Min", self.min_spinbox)
+		form_layout.addRow("Max", self.max_spinbox)
+
+		buttons_layout = QtWidgets.QHBoxLayout()
+		buttons_layout.setContentsMargins(0, 0, 0, 0)
+
+		self.submit_button = QtWidgets.QPushButton("Create Button")
+		self.cancel_button = QtWidgets.QPushButton("Cancel")
+
+		buttons_layout.addWidget(self.submit_button)
+		buttons_layout.addWidget(self.cancel_button)
+
+		main_layout.addLayout(form_layout)
+		main_layout.addLayout(buttons_layout)
+
+		self.setLayout(main_layout)
+
+	def connectInterface(self):
+		self.submit_button.clicked.connect(self.createButtonCommand)
+		self.cancel_button.clicked.connect(self.cancelCommand)
+
+	def createButtonCommand(self):
+		self.attribute = self.attribute_textfield.text()
+
+		if self.attribute:
+			self.close()
 
-		elif position_based:
-			if cmds.xform(selection, q=True, t=True, ws=True)[0] > 0:
-				return QtGui.QColor(120, 120, 255)
-			elif cmds.xform(selection, q=True, t=True, ws=True)[0] < 0:
-				return QtGui.QColor(255, 120, 120)
+	def cancelCommand(self):
+		self.validate = False
+		self.close()
 
-		return QtGui.QColor(255, 249, 23)
+	def getData(self):
+		if self.validate:
+			if self.attribute and self.min_spinbox.value() < self.max_spinbox.value():
+				result = {}
+				result["attribute"] = self.attribute
+				result["min"] = self.min_spinbox.value()
+				result["max"] = self.max_spinbox.value()
+				return result
+		return None
 
-	def addEditorButton(self, pos, size, elem, shape, color, text, script):
-		self.buttons_list.append(EditorButton(pos[0], pos[1], size[0], size[1], elem, shape, color, text, script))
 
-	def verticalAlignMin(self):
-		min_button = self.selected_list[0]
+class PickerLoaderSignals(QtCore.QObject):
+	loaded = QtCore.Signal(str, object)
 
-		for button in self.selected_list:
-			if button.getPosX() < min_button.getPosX():
-				min_button = button
 
-		for button in self.selected_list:
-			button.setPosX(min_button.getPosX())
+class PickerLoader(QtCore.QRunnable):
+	def __init__(self, path, signals):
+		super(PickerLoader, self).__init__()
 
-		self.repaint()
+		self.path = path
+		self.signals = signals
 
-	def verticalAlignMax(self):
-		min_button = self.selected_list[0]
+	def run(self):
+		try:
+			with open(self.path, "rb") as file:
+				data = pickle.load(file)
+		except Exception:
+			# The file may still be being written, the next change event will retry
+			data = None
 
-		for button in self.selected_list:
-			if button.getPosX() > min_button.getPosX():
-				min_button = button
+		self.signals.loaded.emit(self.path, data)
 
-		for button in self.selected_list:
-			button.setPosX(min_button.getPosX())
 
-		self.repaint()
+class PickerRenderer(QtCore.QThread):
+	frame_ready = QtCore.Signal(object)
 
-	def horizontalAlignMin(self):
-		min_button = self.selected_list[0]
+	def __init__(self, parent=None):
+		super(PickerRenderer, self).__init__(parent)
 
-		for button in self.selected_list:
-			if button.getPosY() < min_button.getPosY():
-				min_button = button
+		self.mutex = QtCore.QMutex()
+		self.condition = QtCore.QWaitCondition()
+		self.request = None
+		self.stopped = False
 
-		for button in self.selected_list:
-			button.setPosY(min_button.getPosY())
+	def requestFrame(self, request):
+		# Only the latest request is kept, older ones are dropped
+		self.mutex.lock()
+		self.request = request
+		self.condition.wakeOne()
+		self.mutex.unlock()
 
-		self.repaint()
+	def stop(self):
+		self.mutex.lock()
+		self.stopped = True
+		self.condition.wakeOne()
+		self.mutex.unlock()
+		self.wait()
 
-	def horizontalAlignMax(self):
-		min_button = self.selected_list[0]
+	def run(self):
+		while True:
+			self.mutex.lock()
+			while self.request is None and not self.stopped:
+				self.condition.wait(self.mutex)
 
-		for button in self.selected_list:
-			if button.getPosY() > min_button.getPosY():
-				min_button = button
+			if self.stopped:
+				self.mutex.unlock()
+				return
 
-		for button in self.selected_list:
-			button.setPosY(min_button.getPosY())
+			request = self.request
+			self.request = None
+			self.mutex.unlock()
 
-		self.repaint()
+			self.frame_ready.emit(renderButtonLayer(*request))
 
-	def align(self):
-		start_button = self.selected_list[-1]
-		end_button = self.selected_list[-2]
 
-		vec = [end_button.getPosX() - start_button.getPosX(), end_button.getPosY() - start_button.getPosY()]
+class ThumbnailLoaderSignals(QtCore.QObject):
+	loaded = QtCore.Signal(str, object)
 
-		intervals = len(self.selected_list) - 1
 
-		inter_vec = [vec[0] / intervals, vec[1] / intervals]
+class ThumbnailLoader(QtCore.QRunnable):
+	def __init__(self, path, cache_dir, signals):
+		super(ThumbnailLoader, self).__init__()
 
-		for i, button in enumerate(self.selected_list[:-2]):
-			button.setPosX(start_button.getPosX() + inter_vec[0] * (i + 1))
-			button.setPosY(start_button.getPosY() + inter_vec[1] * (i + 1))
+		self.path = path
+		self.cache_dir = cache_dir
+		self.signals = signals
 
-		self.repaint()
+	def run(self):
+		image = QtGui.QImage()
 
+		try:
+			with open(self.path, "rb") as file:
+				raw = file.read()
 
-class EditorButton():
-	def __init__(self, pos_x, pos_y, radius_x, radius_y, selection, shape, color, text, script):
-		self.pos_x = pos_x
-		self.pos_y = pos_y
-		self.default_radius_x = radius_x
-		self.radius_x = radius_x
-		self.default_radius_y = radius_y
-		self.radius_y = radius_y
-		self.size_offset = 0
-		self.edit_offset = (0, 0)
-		self.selection = selection
-		self.shape = shape
-		self.color = color
-		self.selected_color = QtGui.QColor.fromHsv(self.color.hue(), max(self.color.saturation() - 100, 0), min(self.color.value() + 100, 255))
-		self.text = text
-		self.script = script
+			thumbnail_path = os.path.join(self.cache_dir, hashlib.sha1(raw).hexdigest() + ".png")
 
-		self.selected = False
+			if os.path.isfile(thumbnail_path):
+				image = QtGui.QImage(thumbnail_path)
 
-	def getPosX(self):
-		return self.pos_x
+			if image.isNull():
+				image = renderPickerImage(pickle.loads(raw))
+				image = image.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+				image.save(thumbnail_path)
+		except Exception:
+			image = QtGui.QImage()
 
-	def getPosY(self):
-		return self.pos_y
+		self.signals.loaded.emit(self.path, image)
 
-	def setPosX(self, pos_x):
-		self.pos_x = pos_x
 
-	def setPosY(self, pos_y):
-		self.pos_y = pos_y
+class PickerLibrary(QtWidgets.QDialog):
+	thumbnails = {}
 
-	def getRadiusX(self):
-		return self.radius_x
+	def __init__(self, parent=None):
+		super(PickerLibrary, self).__init__(parent)
 
-	def getRadiusY(self):
-		return self.radius_y
+		self.validate = True
+		self.path = ""
+		self.items = {}
 
-	def setEditOffset(self, edit_offset):
-		self.edit_offset = edit_offset
+		self.thread_pool = QtCore.QThreadPool(self)
+		self.loader_signals = ThumbnailLoaderSignals(self)
+		self.cache_dir = os.path.join(getCacheDir(), "thumbnails")
 
-	def getEditOffset(self):
-		return self.edit_offset
+		if not os.path.isdir(self.cache_dir):
+			os.makedirs(self.cache_dir)
 
-	def getSelection(self):
-		return self.selection
+		self.setInterface()
+		self.connectInterface()
+		self.populate()
 
-	def getShape(self):
-		return self.shape
+	def setInterface(self):
+		main_layout = QtWidgets.QVBoxLayout()
 
-	def getColor(self):
-		return self.color
+		self.picker_list = QtWidgets.QListWidget()
+		self.picker_list.setViewMode(QtWidgets.QListView.IconMode)
+		self.picker_list.setIconSize(QtCore.QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+		self.picker_list.setResizeMode(QtWidgets.QListView.Adjust)
+		self.picker_list.setMovement(QtWidgets.QListView.Static)
+		self.picker_list.setUniformItemSizes(True)
+		self.picker_list.setMinimumSize(700, 450)
 
-	def setColor(self, color):
-		self.color = color
-		self.selected_color = QtGui.QColor.fromHsv(self.color.hue(), max(self.color.saturation() - 120, 0), min(self.color.value() + 120, 255))
+		buttons_layout = QtWidgets.QHBoxLayout()
+		buttons_layout.setContentsMargins(0, 0, 0, 0)
 
-	def getText(self):
-		return self.text
+		self.add_folder_button = QtWidgets.QPushButton("Add Folder")
+		self.submit_button = QtWidgets.QPushButton("Open")
+		self.cancel_button = QtWidgets.QPushButton("Cancel")
 
-	def setText(self, text):
-		self.text = text
+		buttons_layout.addWidget(self.add_folder_button)
+		buttons_layout.addStretch(1)
+		buttons_layout.addWidget(self.submit_button)
+		buttons_layout.addWidget(self.cancel_button)
 
-		if self.text:
-			qp = QtGui.QPainter()
-			font = qp.font()
-			fm = QtGui.QFontMetrics(font)
-			rect = fm.boundingRect(self.text)
+		main_layout.addWidget(self.picker_list)
+		main_layout.addLayout(buttons_layout)
 
-			self.radius_x = rect.width() + 5 + self.size_offset
-			self.radius_y = rect.height() + 2 + self.size_offset
+		self.setLayout(main_layout)
 
-		else:
-			self.radius_x = self.default_radius_x + self.size_offset
-			self.radius_y = self.default_radius_y + self.size_offset
+	def connectInterface(self):
+		self.loader_signals.loaded.connect(self.thumbnailLoaded)
+		self.picker_list.itemDoubleClicked.connect(self.openCommand)
+		self.add_folder_button.clicked.connect(self.addFolderCommand)
+		self.submit_button.clicked.connect(self.openCommand)
+		self.cancel_button.clicked.connect(self.cancelCommand)
 
-	def getScript(self):
-		return self.script
+	def populate(self):
+		self.thread_pool.clear()
+		self.picker_list.clear()
+		self.items = {}
 
-	def getSize(self):
-		return self.size_offset
+		placeholder = QtGui.QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+		placeholder.fill(QtGui.QColor(50, 50, 50))
+		placeholder_icon = QtGui.QIcon(placeholder)
 
-	def setSize(self, size):
-		self.size_offset = size
+		for folder in getLibraryFolders():
+			if not os.path.isdir(folder):
+				continue
 
-		if self.text:
-			qp = QtGui.QPainter()
-			font = qp.font()
-			fm = QtGui.QFontMetrics(font)
-			rect = fm.boundingRect(self.text)
+			for file_name in sorted(os.listdir(folder)):
+				if os.path.splitext(file_name)[1] != ".pik":
+					continue
 
-			self.radius_x = rect.width() + 5 + self.size_offset
-			self.radius_y = rect.height() + 2 + self.size_offset
+				path = os.path.join(folder, file_name)
+				key = (path, os.path.getmtime(path))
 
-		else:
-			self.radius_x = self.default_radius_x + self.size_offset
-			self.radius_y = self.default_radius_y + self.size_offset
+				item = QtWidgets.QListWidgetItem(os.path.splitext(file_name)[0])
+				item.setData(QtCore.Qt.UserRole, path)
+				item.setToolTip(path)
+				self.picker_list.addItem(item)
+				self.items[path] = item
 
-	def select(self):
-		self.selected = True
+				if key in PickerLibrary.thumbnails:
+					item.setIcon(PickerLibrary.thumbnails[key])
+				else:
+					item.setIcon(placeholder_icon)
+					self.thread_pool.start(ThumbnailLoader(path, self.cache_dir, self.loader_signals))
 
-	def deselect(self):
-		self.selected = False
+	def thumbnailLoaded(self, path, image):
+		item = self.items.get(path)
 
-	def executeScript(self):
-		exec(self.script)
+		if item is not None and not image.isNull():
+			icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+			item.setIcon(icon)
 
-	def getSelected(self):
-		return self.selected
+			if os.path.isfile(path):
+				PickerLibrary.thumbnails[(path, os.path.getmtime(path))] = icon
 
-	def draw(self, qp, edit_mode):
-		qp.setBrush(self.color)
-		qp.setPen(QtGui.QColor(10, 10, 10))
+	def addFolderCommand(self):
+		folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Add picker folder")
 
-		if self.selected:
-			qp.setBrush(self.selected_color)
-			if edit_mode:
-				qp.setBrush(self.color)
-				qp.setPen(self.selected_color)
+		if folder:
+			folders = getLibraryFolders()
+			if folder not in folders:
+				folders.append(folder)
+				setLibraryFolders(folders)
+			self.populate()
 
-		size_x = self.radius_x
-		size_y = self.radius_y
+	def openCommand(self):
+		item = self.picker_list.currentItem()
 
-		if self.shape == "ellipse":
-			if self.text:
-				qp.drawRoundedRect(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y, 5, 5)
-				qp.drawText(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y, QtCore.Qt.AlignVCenter|QtCore.Qt.AlignHCenter, self.text)
-			else:
-				qp.drawEllipse(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y)
-		elif self.shape == "rect":
-			qp.drawRect(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y)
+		if item is not None:
+			self.path = item.data(QtCore.Qt.UserRole)
+			self.close()
+
+	def cancelCommand(self):
+		self.validate = False
+		self.close()
 
-			if self.text:
-				qp.drawText(self.pos_x - size_x/2, self.pos_y - size_y/2, size_x, size_y, QtCore.Qt.AlignVCenter|QtCore.Qt.AlignHCenter, self.text)
+	def done(self, result):
+		self.thread_pool.clear()
+		self.thread_pool.waitForDone()
+		super(PickerLibrary, self).done(result)
 
-	def isOnButton(self, x, y):
-		if x > self.pos_x - self.radius_x/2:
-			if x < self.pos_x + self.radius_x/2:
-				if y > self.pos_y - self.radius_y/2:
-					if y < self.pos_y + self.radius_y/2:
-						return True
-		return False
+	def getData(self):
+		if self.validate:
+			if self.path:
+				result = {}
+				result["path"] = self.path
+				return result
+		return None
 
 
 class TextEditor(QtWidgets.QDialog):
@@ -1011,6 +3341,580 @@ class ColorDisplay(QtWidgets.QWidget):
 		self.repaint()
 
 
+NUMERIC_ATTRIBUTE_TYPES = ("bool", "byte", "char", "short", "long", "enum", "float", "double", "doubleLinear", "doubleAngle", "time")
+
+
+def isNumericAttribute(plug_name):
+	node, attribute = plug_name.split(".", 1)
+
+	if not cmds.objExists(node) or not cmds.attributeQuery(attribute, node=node, exists=True):
+		return False
+	return cmds.getAttr(plug_name, type=True) in NUMERIC_ATTRIBUTE_TYPES
+
+
+def getPlugs(plug_names):
+	names = []
+	plugs = []
+
+	selection_list = om.MSelectionList()
+	for name in plug_names:
+		try:
+			selection_list.add(name)
+		except RuntimeError:
+			continue
+
+		# Locked plugs and plugs driven by constraints or expressions would
+		# make the whole batched setAttr fail part way through. Keyed plugs
+		# are kept: setting them is what animators expect.
+		plug = selection_list.getPlug(selection_list.length() - 1)
+		if plug.isLocked:
+			continue
+
+		source = plug.source()
+		if not source.isNull and not source.node().hasFn(om.MFn.kAnimCurve):
+			continue
+
+		names.append(name)
+		plugs.append(plug)
+
+	return names, plugs
+
+
+def getPlugValueType(plug):
+	attribute = plug.attribute()
+
+	if attribute.hasFn(om.MFn.kUnitAttribute):
+		unit_type = om.MFnUnitAttribute(attribute).unitType()
+		if unit_type == om.MFnUnitAttribute.kAngle:
+			return "angle"
+		elif unit_type == om.MFnUnitAttribute.kDistance:
+			return "distance"
+	elif attribute.hasFn(om.MFn.kEnumAttribute):
+		return "int"
+	elif attribute.hasFn(om.MFn.kNumericAttribute):
+		numeric_type = om.MFnNumericAttribute(attribute).numericType()
+		if numeric_type == om.MFnNumericData.kBoolean:
+			return "bool"
+		elif numeric_type in (om.MFnNumericData.kByte, om.MFnNumericData.kChar, om.MFnNumericData.kShort, om.MFnNumericData.kInt, om.MFnNumericData.kLong):
+			return "int"
+
+	return "double"
+
+
+def readPlugValues(plugs):
+	values = []
+
+	for plug in plugs:
+		value_type = getPlugValueType(plug)
+
+		if value_type == "angle":
+			values.append(om.MAngle(plug.asDouble()).asUnits(om.MAngle.uiUnit()))
+		elif value_type == "distance":
+			values.append(om.MDistance(plug.asDouble()).asUnits(om.MDistance.uiUnit()))
+		elif value_type == "bool":
+			values.append(float(plug.asBool()))
+		elif value_type == "int":
+			values.append(float(plug.asInt()))
+		else:
+			values.append(plug.asDouble())
+
+	return values
+
+
+def previewPlugValues(plugs, values):
+	# Not registered with the undo queue: used for interactive updates only,
+	# the final value is committed through setPlugValues.
+	modifier = om.MDGModifier()
+
+	for plug, value in zip(plugs, values):
+		value_type = getPlugValueType(plug)
+
+		if value_type == "angle":
+			modifier.newPlugValueDouble(plug, om.MAngle(value, om.MAngle.uiUnit()).asUnits(om.MAngle.internalUnit()))
+		elif value_type == "distance":
+			modifier.newPlugValueDouble(plug, om.MDistance(value, om.MDistance.uiUnit()).asUnits(om.MDistance.internalUnit()))
+		elif value_type == "bool":
+			modifier.newPlugValueBool(plug, bool(round(value)))
+		elif value_type == "int":
+			modifier.newPlugValueInt(plug, int(round(value)))
+		else:
+			modifier.newPlugValueDouble(plug, value)
+
+	modifier.doIt()
+
+
+def setPlugValues(plug_names, values):
+	# One undoable call for the whole batch instead of one cmds.setAttr per plug.
+	if plug_names:
+		mel.eval("".join('setAttr "{}" {:.10g};'.format(name, value) for name, value in zip(plug_names, values)))
+
+
+REGULAR_POLYGON_POINTS = [(0.5 * math.cos(math.pi / 3 * i), 0.5 * math.sin(math.pi / 3 * i)) for i in range(6)]
+
+
+def buildButtonPath(shape, shape_data, size_x, size_y, has_text):
+	path = QtGui.QPainterPath()
+
+	if shape == "ellipse":
+		if has_text:
+			path.addRoundedRect(-size_x/2, -size_y/2, size_x, size_y, 5, 5)
+		else:
+			path.addEllipse(-size_x/2, -size_y/2, size_x, size_y)
+
+	elif shape == "polygon":
+		points = shape_data or REGULAR_POLYGON_POINTS
+		path.addPolygon(QtGui.QPolygonF([QtCore.QPointF(x * size_x, y * size_y) for x, y in points]))
+		path.closeSubpath()
+
+	elif shape == "freeform" and len(shape_data) > 2:
+		points = [QtCore.QPointF(x * size_x, y * size_y) for x, y in shape_data]
+		path.moveTo((points[-1] + points[0]) * 0.5)
+		for i, point in enumerate(points):
+			path.quadTo(point, (point + points[(i + 1) % len(points)]) * 0.5)
+		path.closeSubpath()
+
+	elif shape == "svg" and shape_data:
+		for command in shape_data:
+			coords = [QtCore.QPointF(command[i] * size_x, command[i + 1] * size_y) for i in range(1, len(command), 2)]
+
+			if command[0] == "M":
+				path.moveTo(coords[0])
+			elif command[0] == "L":
+				path.lineTo(coords[0])
+			elif command[0] == "Q":
+				path.quadTo(coords[0], coords[1])
+			elif command[0] == "C":
+				path.cubicTo(coords[0], coords[1], coords[2])
+			elif command[0] == "Z":
+				path.closeSubpath()
+
+	else:
+		path.addRect(-size_x/2, -size_y/2, size_x, size_y)
+
+	return path
+
+
+SVG_PATH_ARGUMENT_COUNTS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2}
+
+
+def parseSvgPath(path_string):
+	# Every command letter is tokenized so an unsupported one can't have its
+	# numbers silently read as arguments of the previous command
+	tokens = re.findall(r"[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?|[A-Za-z]", path_string)
+	commands = []
+
+	current = (0.0, 0.0)
+	start = (0.0, 0.0)
+	control = None
+	command = None
+	i = 0
+
+	while i < len(tokens):
+		if tokens[i].isalpha():
+			command = tokens[i]
+			i += 1
+
+			if command in "Zz":
+				commands.append(("Z",))
+				current = start
+				control = None
+				continue
+
+			if command.upper() not in SVG_PATH_ARGUMENT_COUNTS:
+				raise ValueError("unsupported path command '{}'".format(command))
+
+		if command is None:
+			break
+
+		relative = command.islower()
+		upper = command.upper()
+		count = SVG_PATH_ARGUMENT_COUNTS[upper]
+		values = [float(token) for token in tokens[i:i + count]]
+		i += count
+
+		if len(values) < count:
+			break
+
+		if upper == "H":
+			values = [values[0] + (current[0] if relative else 0), current[1]]
+			relative = False
+			upper = "L"
+		elif upper == "V":
+			values = [current[0], values[0] + (current[1] if relative else 0)]
+			relative = False
+			upper = "L"
+
+		if relative:
+			values = [value + current[j % 2] for j, value in enumerate(values)]
+
+		# Smooth curves reflect the previous control point, or start from the
+		# current point when the previous segment was not of the same kind
+		if upper == "S":
+			reflected = current
+			if control and commands and commands[-1][0] == "C":
+				reflected = (2 * current[0] - control[0], 2 * current[1] - control[1])
+			values = list(reflected) + values
+			upper = "C"
+		elif upper == "T":
+			reflected = current
+			if control and commands and commands[-1][0] == "Q":
+				reflected = (2 * current[0] - control[0], 2 * current[1] - control[1])
+			values = list(reflected) + values
+			upper = "Q"
+
+		commands.append((upper,) + tuple(values))
+		current = (values[-2], values[-1])
+		control = (values[-4], values[-3]) if upper in "CQ" else None
+
+		if upper == "M":
+			start = current
+			# Coordinate pairs following a moveto are implicit linetos
+			command = "l" if relative else "L"
+
+	return commands
+
+
+def loadSvgShape(svg_path):
+	# Only needed when importing a shape, so it stays out of startup imports
+	import xml.etree.ElementTree as ElementTree
+
+	commands = []
+
+	try:
+		root = ElementTree.parse(svg_path).getroot()
+	except ElementTree.ParseError as error:
+		raise ValueError("malformed SVG ({})".format(error))
+
+	for element in root.iter():
+		tag = element.tag.split("}")[-1]
+
+		if element.get("transform") and any(child.tag.split("}")[-1] == "path" for child in element.iter()):
+			raise ValueError("transform attributes are not supported")
+
+		if tag == "path" and element.get("d"):
+			commands.extend(parseSvgPath(element.get("d")))
+
+	xs = [command[i] for command in commands for i in range(1, len(command), 2)]
+	ys = [command[i] for command in commands for i in range(2, len(command), 2)]
+
+	if not xs:
+		return []
+
+	width = (max(xs) - min(xs)) or 1.0
+	height = (max(ys) - min(ys)) or 1.0
+	center_x = (max(xs) + min(xs)) / 2
+	center_y = (max(ys) + min(ys)) / 2
+
+	shape_data = []
+	for command in commands:
+		coords = []
+		for i in range(1, len(command), 2):
+			coords.append((command[i] - center_x) / width)
+			coords.append((command[i + 1] - center_y) / height)
+		shape_data.append((command[0],) + tuple(coords))
+
+	return shape_data
+
+
+SCENE_INDEX_KEY = "martopickerPickers"
+SCENE_BLOB_PREFIX = "martopickerBlob_"
+
+
+def getScenePickerIndex():
+	# fileInfo escapes quotes on query, so the index is stored base64 encoded as well
+	values = cmds.fileInfo(SCENE_INDEX_KEY, q=True)
+
+	if values:
+		return json.loads(base64.b64decode(values[0]).decode("utf-8"))
+	return {}
+
+
+def setScenePickerIndex(index):
+	if index:
+		cmds.fileInfo(SCENE_INDEX_KEY, base64.b64encode(json.dumps(index).encode("utf-8")).decode("ascii"))
+	else:
+		cmds.fileInfo(remove=SCENE_INDEX_KEY)
+
+
+def getCanonicalPickerData(data):
+	# Detached copies with the selection and drag state cleared, so the same
+	# picker always hashes to the same blob whatever is highlighted
+	data = pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+
+	for button in data["buttons"]:
+		button.resetInteraction()
+
+	return data
+
+
+def writeScenePicker(name, data):
+	raw = pickle.dumps(getCanonicalPickerData(data), pickle.HIGHEST_PROTOCOL)
+	digest = hashlib.sha1(raw).hexdigest()
+	blob_key = SCENE_BLOB_PREFIX + digest
+
+	if not cmds.fileInfo(blob_key, q=True):
+		cmds.fileInfo(blob_key, base64.b64encode(zlib.compress(raw, 9)).decode("ascii"))
+
+	index = getScenePickerIndex()
+	previous_digest = index.get(name)
+	index[name] = digest
+	setScenePickerIndex(index)
+
+	if previous_digest and previous_digest != digest and previous_digest not in index.values():
+		cmds.fileInfo(remove=SCENE_BLOB_PREFIX + previous_digest)
+
+
+def readScenePicker(name):
+	digest = getScenePickerIndex().get(name)
+
+	if digest:
+		values = cmds.fileInfo(SCENE_BLOB_PREFIX + digest, q=True)
+		if values:
+			return pickle.loads(zlib.decompress(base64.b64decode(values[0])))
+	return None
+
+
+def drawPicker(qp, background, buttons, edit_mode):
+	if background is not None:
+		if isinstance(background, QtGui.QImage):
+			qp.drawImage(0, 0, background)
+		else:
+			qp.drawPixmap(background.rect(), background)
+
+	# Painter state is only set again when the style changes between two
+	# consecutive buttons, so the list order (and what hit tests find) is kept
+	style_table = StyleTable.get()
+	current_key = None
+
+	for button in buttons:
+		if button.hasCustomDraw():
+			button.draw(qp, edit_mode)
+			current_key = None
+			continue
+
+		key = (button.getStyleId(), button.getSelected())
+		if key != current_key:
+			style_table.getStyle(key[0]).apply(qp, key[1], edit_mode)
+			current_key = key
+
+		button.drawShape(qp)
+
+
+def renderButtonLayer(buttons, width, height, pixel_ratio, edit_mode):
+	image = QtGui.QImage(int(width * pixel_ratio), int(height * pixel_ratio), QtGui.QImage.Format_ARGB32_Premultiplied)
+	image.setDevicePixelRatio(pixel_ratio)
+	image.fill(QtCore.Qt.transparent)
+
+	qp = QtGui.QPainter()
+	qp.begin(image)
+	qp.setRenderHint(QtGui.QPainter.Antialiasing, True)
+	drawPicker(qp, None, buttons, edit_mode)
+	qp.end()
+
+	return image
+
+
+def renderPickerImage(data):
+	# Only uses QImage so that it can run outside of the GUI thread
+	background = None
+	width = 600
+	height = 400
+
+	if data["background"] and os.path.isfile(data["background"]):
+		background = QtGui.QImage(data["background"]).scaledToWidth(600, QtCore.Qt.SmoothTransformation)
+		width = background.width()
+		height = background.height()
+
+	for button in data["buttons"]:
+		width = max(width, int(button.getPosX() + button.getRadiusX()))
+		height = max(height, int(button.getPosY() + button.getRadiusY()))
+
+	image = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+	image.fill(QtGui.QColor(50, 50, 50))
+
+	qp = QtGui.QPainter()
+	qp.begin(image)
+	qp.setRenderHint(QtGui.QPainter.Antialiasing, True)
+	drawPicker(qp, background, data["buttons"], False)
+	qp.end()
+
+	return image
+
+
+THUMBNAIL_SIZE = 160
+LIBRARY_FOLDERS_OPTION = "martopickerLibraryFolders"
+
+
+def getLibraryFolders():
+	if cmds.optionVar(exists=LIBRARY_FOLDERS_OPTION):
+		return list(cmds.optionVar(q=LIBRARY_FOLDERS_OPTION) or [])
+	return []
+
+
+def setLibraryFolders(folders):
+	cmds.optionVar(clearArray=LIBRARY_FOLDERS_OPTION)
+	for folder in folders:
+		cmds.optionVar(stringValueAppend=(LIBRARY_FOLDERS_OPTION, folder))
+
+
+PICKER_CACHE_VERSION = 2
+LAST_SESSION_OPTION = "martopickerLastSession"
+BUTTON_KINDS = (EditorButton, AttributeButton, PoseButton)
+BUTTON_GEOMETRY_FIELDS = 7
+
+
+def packPickerButtons(buttons, groups):
+	# One flat array per field instead of one pickled object per button
+	kinds = array.array("B")
+	geometry = array.array("d")
+	colors = array.array("I")
+	selection_names = []
+	selection_ends = array.array("I")
+	texts = []
+	scripts = []
+	shapes = []
+	button_ids = []
+	shape_data = {}
+	extras = {}
+	indices = {}
+
+	for i, button in enumerate(buttons):
+		indices[button] = i
+		kinds.append(BUTTON_KINDS.index(type(button)))
+		geometry.extend((button.pos_x, button.pos_y, button.default_radius_x, button.default_radius_y, button.radius_x, button.radius_y, button.size_offset))
+		colors.append(StyleTable.get().getStyle(button.style_id).getFill().rgba())
+		selection_names.extend(button.selection)
+		selection_ends.append(len(selection_names))
+		texts.append(button.text)
+		scripts.append(button.script)
+		shapes.append(button.shape)
+		button_ids.append(button.button_id)
+
+		if button.shape_data:
+			shape_data[i] = button.shape_data
+
+		if isinstance(button, AttributeButton):
+			extras[i] = (button.attribute, button.min_value, button.max_value)
+		elif isinstance(button, PoseButton):
+			extras[i] = (button.pose_plugs, button.pose_values)
+
+	def packGroup(group):
+		members = [packGroup(member) if isinstance(member, ButtonGroup) else indices[member] for member in group.getMembers()]
+		color = StyleTable.get().getStyle(group.style_id).getFill().rgba() if group.style_id is not None else None
+		return (group.isVisible(), color, members)
+
+	return {
+		"kinds": kinds.tobytes(),
+		"geometry": geometry.tobytes(),
+		"colors": colors.tobytes(),
+		"selection_names": selection_names,
+		"selection_ends": selection_ends.tobytes(),
+		"texts": texts,
+		"scripts": scripts,
+		"shapes": shapes,
+		"button_ids": button_ids,
+		"shape_data": shape_data,
+		"extras": extras,
+		"groups": [packGroup(group) for group in groups],
+	}
+
+
+def unpackPickerButtons(packed):
+	kinds = array.array("B")
+	kinds.frombytes(packed["kinds"])
+	geometry = array.array("d")
+	geometry.frombytes(packed["geometry"])
+	colors = array.array("I")
+	colors.frombytes(packed["colors"])
+	selection_ends = array.array("I")
+	selection_ends.frombytes(packed["selection_ends"])
+
+	selection_names = packed["selection_names"]
+	shape_data = packed["shape_data"]
+	extras = packed["extras"]
+
+	buttons = []
+	selection_start = 0
+
+	for i, kind in enumerate(kinds):
+		pos_x, pos_y, default_radius_x, default_radius_y, radius_x, radius_y, size_offset = geometry[i * BUTTON_GEOMETRY_FIELDS:(i + 1) * BUTTON_GEOMETRY_FIELDS]
+		selection = selection_names[selection_start:selection_ends[i]]
+		selection_start = selection_ends[i]
+		color = QtGui.QColor.fromRgba(colors[i])
+
+		button_class = BUTTON_KINDS[kind]
+		if button_class is AttributeButton:
+			attribute, min_value, max_value = extras[i]
+			button = AttributeButton(pos_x, pos_y, default_radius_x, default_radius_y, selection, color, attribute, min_value, max_value)
+		elif button_class is PoseButton:
+			button = PoseButton(pos_x, pos_y, default_radius_x, default_radius_y, selection, color)
+			button.pose_plugs = extras[i][0]
+			button.pose_values = array.array("d", extras[i][1])
+		else:
+			button = EditorButton(pos_x, pos_y, default_radius_x, default_radius_y, selection, packed["shapes"][i], color, packed["texts"][i], packed["scripts"][i])
+
+		button.shape = packed["shapes"][i]
+		button.text = packed["texts"][i]
+		button.script = packed["scripts"][i]
+		button.shape_data = shape_data.get(i, [])
+		button.button_id = packed["button_ids"][i]
+		button.radius_x = radius_x
+		button.radius_y = radius_y
+		button.size_offset = size_offset
+
+		buttons.append(button)
+
+	def unpackGroup(packed_group):
+		visible, color, members = packed_group
+		group = ButtonGroup([unpackGroup(member) if isinstance(member, tuple) else buttons[member] for member in members])
+		group.setVisible(visible)
+		if color is not None:
+			group.setColor(QtGui.QColor.fromRgba(color))
+		return group
+
+	return buttons, [unpackGroup(group) for group in packed["groups"]]
+
+
+def getCacheDir():
+	cache_dir = os.path.join(cmds.internalVar(userAppDir=True), "martopicker", "cache")
+
+	if not os.path.isdir(cache_dir):
+		os.makedirs(cache_dir)
+
+	return cache_dir
+
+
+def getPickerCachePath(picker_path):
+	key = hashlib.sha1(os.path.normcase(os.path.abspath(picker_path)).encode("utf-8")).hexdigest()
+	return os.path.join(getCacheDir(), key + ".pikc")
+
+
+def getLastSession():
+	if cmds.optionVar(exists=LAST_SESSION_OPTION):
+		return list(cmds.optionVar(q=LAST_SESSION_OPTION) or [])
+	return []
+
+
+def setLastSession(paths):
+	cmds.optionVar(clearArray=LAST_SESSION_OPTION)
+	for path in paths:
+		cmds.optionVar(stringValueAppend=(LAST_SESSION_OPTION, path))
+
+
+def rememberPicker(path):
+	paths = getLastSession()
+	if path not in paths:
+		paths.append(path)
+		setLastSession(paths)
+
+
+def forgetPicker(path):
+	paths = getLastSession()
+	if path in paths:
+		paths.remove(path)
+		setLastSession(paths)
+
+
 def getMayaWindow():
 	ptr = mui.MQtUtil.mainWindow()
 	return shiboken2.wrapInstance(int(ptr), QtWidgets.QWidget)
@@ -1018,8 +3922,23 @@ def getMayaWindow():
 
 def main():
 	global ui
-	ui = Martopicker(getMayaWindow())
-	ui.show(dockable=True)
+	global pickers
+
+	pickers = []
+	paths = [path for path in getLastSession() if os.path.isfile(path)]
+
+	if paths:
+		for path in paths:
+			ui = Martopicker(getMayaWindow())
+			ui.editor.loadPicker(path)
+			ui.show(dockable=True)
+			pickers.append(ui)
+
+	else:
+		# Pickers stored in the scene are only decoded when picked with Ctrl+Shift+O
+		ui = Martopicker(getMayaWindow())
+		ui.show(dockable=True)
+		pickers.append(ui)
 
 
 if __name__ == "__main__":